@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'api',
     'rest_framework',
+    'django_filters',  # templates for the browsable API's filter form
 ]
 
 MIDDLEWARE = [
@@ -82,6 +83,41 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'advanced-api-project',
+    }
+}
+
+# Response cache for Book/Author listings (see api/cache.py).
+# ALIAS picks the entry in CACHES, e.g. a FileBasedCache shared by workers.
+CATALOG_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+}
+
+# Bulk book writes (POST/PATCH /books/bulk/, see api/views.py).
+# BATCH_SIZE rows per INSERT/UPDATE statement, MAX_ROWS rows per request.
+BOOK_BULK = {
+    'BATCH_SIZE': 500,
+    'MAX_ROWS': 1000,
+}
+
+# Most ids accepted by one /books/batch/ lookup
+BOOK_BATCH_MAX_IDS = 100
+
+# /books/?count=true (see api/counts.py). Counts up to THRESHOLD are exact;
+# larger ones are estimated from per-filter statistics cached for STATS_TIMEOUT seconds.
+BOOK_COUNT = {
+    'THRESHOLD': 1000,
+    'STATS_TIMEOUT': 600,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -128,6 +164,11 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
-    ]
+    ],
+    # orjson-backed JSON (falls back to the stdlib encoder when orjson is missing)
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
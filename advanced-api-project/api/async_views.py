@@ -0,0 +1,73 @@
+# api/async_views.py
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from .fast_serializers import ValuesRepresentation
+from .renderers import FastJSONRenderer
+from .views import BookDetailView, BookListView
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    # Same bytes as the DRF views produce
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def error_response(exc):
+    detail = exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail}
+    return json_response(detail, status=exc.status_code)
+
+
+def configured_view(view_class, request, **kwargs):
+    """
+    An instance of a DRF view bound to `request`, used for its queryset,
+    filter backends, serializer and paginator only. These endpoints are
+    read-only and public, so authentication/permissions are not run.
+    """
+    view = view_class()
+    view.setup(request, **kwargs)
+    view.request = view.initialize_request(request, **kwargs)
+    view.format_kwarg = None
+    return view
+
+
+class AsyncBookListView(View):
+    """
+    Async twin of BookListView (same filters, search, ordering, keyset
+    pagination and output) for ASGI deployments: the page rows are read
+    with the async ORM, so no worker thread is parked on the connection
+    while a slow client sends its request or reads the response.
+    """
+
+    @staticmethod
+    def prepare(request):
+        # Filter validation may hit the database (e.g. ?author= is checked
+        # against Author), so build the lazy page queryset in a thread
+        view = configured_view(BookListView, request)
+        fast = ValuesRepresentation(view.get_serializer())
+        queryset = fast.values(view.filter_queryset(view.get_queryset()))
+        paginator = view.paginator
+        return fast, paginator, paginator.page_queryset(queryset, view.request)
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            fast, paginator, page_queryset = await sync_to_async(self.prepare)(request)
+        except APIException as exc:
+            return error_response(exc)
+        rows = [row async for row in page_queryset.aiterator()]
+        page = paginator.finish_page(rows)
+        return json_response(paginator.get_paginated_response(fast.to_representation(page)).data)
+
+
+class AsyncBookDetailView(View):
+    """Async twin of BookDetailView, fetching the book with aget()."""
+
+    async def get(self, request, pk, *args, **kwargs):
+        view = configured_view(BookDetailView, request, pk=pk)
+        queryset = view.get_queryset()
+        try:
+            book = await queryset.aget(pk=pk)
+        except queryset.model.DoesNotExist:
+            return json_response({'detail': 'No Book matches the given query.'}, status=status.HTTP_404_NOT_FOUND)
+        return json_response(view.get_serializer(book).data)
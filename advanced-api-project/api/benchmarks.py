@@ -0,0 +1,41 @@
+# api/benchmarks.py
+# Helpers shared by the benchmark_* management commands
+import time
+from contextlib import contextmanager
+from django.db import connection
+from .models import Author, Book
+
+
+@contextmanager
+def benchmark_database():
+    """Run the block against a fresh throwaway database (like the test runner)."""
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed_books(total, authors=1000, batch_size=10000):
+    """Top the Book table up to `total` rows with bulk_create (no signals)."""
+    author_ids = list(Author.objects.values_list('id', flat=True))
+    if not author_ids:
+        Author.objects.bulk_create(Author(name=f"Author {i}") for i in range(authors))
+        author_ids = list(Author.objects.values_list('id', flat=True))
+    start = Book.objects.count()
+    for offset in range(start, total, batch_size):
+        Book.objects.bulk_create(
+            Book(
+                title=f"Book {i:07d}",
+                publication_year=1900 + i % 125,
+                author_id=author_ids[i % len(author_ids)],
+            )
+            for i in range(offset, min(offset + batch_size, total))
+        )
+
+
+def rows_per_second(fn, rows):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return rows / elapsed if elapsed else float('inf')
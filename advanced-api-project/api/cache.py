@@ -0,0 +1,128 @@
+# api/cache.py
+import hashlib
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+
+class CatalogCache:
+    """
+    Response cache for catalog (Book/Author) listings.
+
+    Entries are keyed on the request path plus its normalized query
+    parameters and stored under the current catalog version. Any Book or
+    Author write bumps the version (see signals.py), which orphans every
+    older entry at once; they simply expire through the TTL.
+    """
+    version_key = 'catalog:version'
+    stats_keys = {'hits': 'catalog:stats:hits', 'misses': 'catalog:stats:misses'}
+
+    def __init__(self, alias=None, timeout=None):
+        options = getattr(settings, 'CATALOG_CACHE', {})
+        self.alias = alias or options.get('ALIAS', 'default')
+        self.timeout = timeout if timeout is not None else options.get('TIMEOUT', 300)
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    # Catalog version
+
+    def version(self):
+        version = self.cache.get(self.version_key)
+        if version is None:
+            self.cache.add(self.version_key, 1, timeout=None)
+            version = self.cache.get(self.version_key, 1)
+        return version
+
+    def bump(self):
+        try:
+            return self.cache.incr(self.version_key)
+        except ValueError:
+            # Key evicted or never set: start a new version that can't
+            # collide with entries written under the old counter
+            self.cache.set(self.version_key, self.version() + 1, timeout=None)
+            return self.cache.get(self.version_key)
+
+    # Entries
+
+    @staticmethod
+    def normalize_params(query_params):
+        # ?b=2&a=1&c= and ?a=1&b=2 are the same listing
+        items = []
+        for key in sorted(query_params.keys()):
+            values = [value.strip() for value in query_params.getlist(key)]
+            values = [value for value in values if value]
+            if values:
+                items.append((key, values))
+        return items
+
+    def make_key(self, request, namespace):
+        raw = repr((request.get_host(), request.path, self.normalize_params(request.query_params)))
+        digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        return f'catalog:{namespace}:{digest}'
+
+    def get(self, key):
+        data = self.cache.get(key, version=self.version())
+        self._count('hits' if data is not None else 'misses')
+        return data
+
+    def set(self, key, data):
+        self.cache.set(key, data, timeout=self.timeout, version=self.version())
+
+    # Stats
+
+    def _count(self, name):
+        key = self.stats_keys[name]
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            if not self.cache.add(key, 1, timeout=None):
+                self.cache.incr(key)
+
+    def stats(self):
+        hits = self.cache.get(self.stats_keys['hits'], 0)
+        misses = self.cache.get(self.stats_keys['misses'], 0)
+        total = hits + misses
+        return {
+            'version': self.version(),
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+        }
+
+    def reset_stats(self):
+        self.cache.delete_many(list(self.stats_keys.values()))
+
+
+catalog_cache = CatalogCache()
+
+
+class CachedResponseMixin:
+    """
+    Serve a view's response data from the catalog cache. Hits skip the
+    database and the serializer entirely; the X-Cache header says which
+    path was taken.
+    """
+    cache_namespace = None
+
+    def cached_response(self, request, build_response):
+        key = catalog_cache.make_key(request, self.cache_namespace or type(self).__name__)
+        data = catalog_cache.get(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = build_response()
+        if response.status_code == 200:
+            catalog_cache.set(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class CachedListMixin(CachedResponseMixin):
+    """Cache list() responses (pagination cursors are part of the key)."""
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(CachedListMixin, self).list(request, *args, **kwargs))
@@ -0,0 +1,59 @@
+# api/changes.py
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from .models import CatalogChange, ChangeFeedCompaction
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+ID_CHUNK_SIZE = 500
+
+
+def record_changes(kind, object_ids, action):
+    """
+    Give each object a fresh sequence number. The previous entry of an
+    object is replaced, so a row updated a thousand times is one entry.
+    Must run inside the writing transaction: on SQLite writers are
+    serialized, so sequence numbers become visible in commit order.
+    """
+    object_ids = list(dict.fromkeys(object_ids))
+    for start in range(0, len(object_ids), ID_CHUNK_SIZE):
+        chunk = object_ids[start:start + ID_CHUNK_SIZE]
+        CatalogChange.objects.filter(kind=kind, object_id__in=chunk).delete()
+        CatalogChange.objects.bulk_create(
+            CatalogChange(kind=kind, object_id=object_id, action=action) for object_id in chunk
+        )
+
+
+def latest_seq():
+    return CatalogChange.objects.aggregate(seq=Max('seq'))['seq'] or 0
+
+
+def compacted_through():
+    return ChangeFeedCompaction.objects.aggregate(seq=Max('compacted_through'))['seq'] or 0
+
+
+def compact(older_than, batch_size=1000):
+    """
+    Drop delete tombstones older than `older_than` (a timedelta) in batches
+    of short transactions. Upserts are never compacted: they describe rows
+    that still exist. Returns the number of tombstones removed.
+    """
+    cutoff = timezone.now() - older_than
+    tombstones = CatalogChange.objects.filter(action=CatalogChange.DELETE, changed_at__lt=cutoff)
+    removed = 0
+    watermark = None
+    while True:
+        with transaction.atomic():
+            seqs = list(tombstones.order_by('seq').values_list('seq', flat=True)[:batch_size])
+            if not seqs:
+                break
+            # Advance the watermark in the same transaction as the delete, so
+            # no client ever syncs past a removed tombstone without a 410
+            if watermark is None:
+                watermark = ChangeFeedCompaction.objects.create(compacted_through=seqs[-1])
+            else:
+                watermark.compacted_through = seqs[-1]
+                watermark.save(update_fields=['compacted_through'])
+            CatalogChange.objects.filter(seq__in=seqs).delete()
+        removed += len(seqs)
+    return removed
@@ -0,0 +1,51 @@
+# api/counts.py
+from django.conf import settings
+from django.db.models import Count
+from .cache import catalog_cache
+from .models import Book
+
+STATS_KEY = 'catalog:count-stats'
+
+# Filters whose row counts are kept in the statistics
+STATS_FIELDS = ['author', 'publication_year']
+
+
+def book_count_stats():
+    """
+    Total books plus books per author and per publication year. Built with
+    one GROUP BY per field and cached for BOOK_COUNT['STATS_TIMEOUT']
+    seconds. Unlike the response cache it is not dropped on every write:
+    it only feeds estimates, and rebuilding it scans the whole table.
+    """
+    cache = catalog_cache.cache
+    stats = cache.get(STATS_KEY)
+    if stats is None:
+        queryset = Book.objects.order_by()
+        stats = {'total': queryset.count()}
+        for field in STATS_FIELDS:
+            rows = queryset.values_list(field).annotate(count=Count('id'))
+            stats[field] = {value: count for value, count in rows}
+        cache.set(STATS_KEY, stats, timeout=getattr(settings, 'BOOK_COUNT', {}).get('STATS_TIMEOUT', 600))
+    return stats
+
+
+def estimate_book_count(query_params):
+    """
+    Estimated size of /books/ for these query parameters, or None when a
+    filter without statistics (title, search) is used. Several filters
+    are assumed to be independent.
+    """
+    if query_params.get('title') or query_params.get('search'):
+        return None
+    stats = book_count_stats()
+    estimate = float(stats['total'])
+    for field in STATS_FIELDS:
+        value = query_params.get(field)
+        if not value:
+            continue
+        try:
+            matching = stats[field].get(int(value), 0)
+        except ValueError:
+            return None
+        estimate *= matching / stats['total'] if stats['total'] else 0
+    return round(estimate)
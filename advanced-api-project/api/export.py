@@ -0,0 +1,68 @@
+# api/export.py
+import csv
+import io
+import json
+from django.http import StreamingHttpResponse
+
+# Columns of an exported book row
+EXPORT_FIELDS = ['id', 'title', 'publication_year', 'author', 'author_name']
+
+# Rows fetched per database round trip and written per output chunk
+DEFAULT_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+FORMATS = list(CONTENT_TYPES)
+
+
+def iter_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    # select_related avoids one author query per book; iterator() streams
+    # rows from the cursor instead of filling the queryset cache
+    queryset = queryset.select_related('author')
+    for book in queryset.iterator(chunk_size=chunk_size):
+        yield (book.id, book.title, book.publication_year, book.author_id, book.author.name)
+
+
+def iter_ndjson(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    lines = []
+    for row in iter_rows(queryset, chunk_size):
+        lines.append(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + '\n')
+        if len(lines) >= chunk_size:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def iter_csv(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    written = 0
+    for row in iter_rows(queryset, chunk_size):
+        writer.writerow(row)
+        written += 1
+        if written % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_export(queryset, export_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    if export_format == 'ndjson':
+        return iter_ndjson(queryset, chunk_size)
+    if export_format == 'csv':
+        return iter_csv(queryset, chunk_size)
+    raise ValueError(f'Unknown export format: {export_format}')
+
+
+def streaming_response(queryset, export_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    response = StreamingHttpResponse(
+        iter_export(queryset, export_format, chunk_size),
+        content_type=CONTENT_TYPES[export_format],
+    )
+    response['Content-Disposition'] = f'attachment; filename="books.{export_format}"'
+    return response
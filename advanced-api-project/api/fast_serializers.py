@@ -0,0 +1,80 @@
+# api/fast_serializers.py
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Serializer fields whose to_representation() leaves a database value
+# unchanged (str -> str, int -> int), so the raw column can be emitted as is
+PASSTHROUGH_FIELDS = (serializers.CharField, serializers.IntegerField)
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+class ValuesRepresentation:
+    """
+    Read-only fast path for a ModelSerializer.
+
+    Instead of building a model instance per row and running every field's
+    to_representation(), fetch exactly the serialized columns with values()
+    and map them straight to output dicts. Only plain columns and
+    PrimaryKeyRelatedField FKs are supported; anything else raises
+    UnsupportedField so the caller can fall back to the serializer. The
+    output matches the serializer's field names, order and values exactly.
+    """
+
+    def __init__(self, serializer):
+        model = serializer.Meta.model
+        self.pairs = []  # (output name, values() column)
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            self.pairs.append((name, self.column_for(model, field)))
+        self.columns = [column for name, column in self.pairs]
+
+    @staticmethod
+    def column_for(model, field):
+        if len(field.source_attrs) != 1:
+            raise UnsupportedField(field.field_name)
+        model_field = model._meta.get_field(field.source)
+        if not model_field.concrete:
+            raise UnsupportedField(field.field_name)
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None or not model_field.many_to_one:
+                raise UnsupportedField(field.field_name)
+            return model_field.attname  # author -> author_id, no join
+        if isinstance(field, PASSTHROUGH_FIELDS) and not getattr(field, 'coerce_to_string', False):
+            return field.source
+        raise UnsupportedField(field.field_name)
+
+    def values(self, queryset):
+        # Also fetch the ordering columns so keyset pagination can build its cursor
+        extra = [field.lstrip('-') for field in queryset.query.order_by if field.lstrip('-') not in ('pk', '?')]
+        columns = list(dict.fromkeys(self.columns + extra + ['id']))
+        return queryset.values(*columns)
+
+    def to_representation(self, rows):
+        pairs = self.pairs
+        return [{name: row[column] for name, column in pairs} for row in rows]
+
+
+class FastListMixin:
+    """
+    list() through ValuesRepresentation when the serializer allows it,
+    otherwise the regular serializer path.
+    """
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        try:
+            fast = ValuesRepresentation(self.get_serializer()) if self.fast_list else None
+        except UnsupportedField:
+            fast = None
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = fast.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.to_representation(page))
+        return Response(fast.to_representation(queryset))
@@ -0,0 +1,168 @@
+# api/importer.py
+import csv
+import json
+import time
+from datetime import date
+from itertools import islice
+from django.db import transaction
+from . import changes
+from .models import Author, Book, CatalogChange, ImportCheckpoint
+from .signals import books_bulk_saved
+from .utils import chunked
+
+FORMATS = ['csv', 'jsonl']
+
+# Books per INSERT, and books per transaction (= per checkpoint)
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_COMMIT_SIZE = 50000
+
+TITLE_MAX_LENGTH = Book._meta.get_field('title').max_length
+NAME_MAX_LENGTH = Author._meta.get_field('name').max_length
+
+
+class InvalidRecord(ValueError):
+    pass
+
+
+def detect_format(path):
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def iter_records(stream, fmt):
+    """Yield one dict per input record (CSV with a header row, or JSON Lines)."""
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # Keep the record so it is counted (and skipped) like any other bad row
+            yield None
+
+
+def clean_record(record):
+    """
+    Return (title, publication_year, author_name) or raise InvalidRecord.
+    Accepts the columns written by export_books (`author_name`) or a plain
+    `author` name; the checks mirror BookSerializer's.
+    """
+    if not isinstance(record, dict):
+        raise InvalidRecord("not an object")
+    title = str(record.get('title') or '').strip()
+    name = str(record.get('author_name') or record.get('author') or '').strip()
+    if not title or len(title) > TITLE_MAX_LENGTH:
+        raise InvalidRecord("missing or too long title")
+    if not name or len(name) > NAME_MAX_LENGTH:
+        raise InvalidRecord("missing or too long author name")
+    try:
+        year = int(record.get('publication_year'))
+    except (TypeError, ValueError):
+        raise InvalidRecord("invalid publication_year")
+    if year > date.today().year:
+        raise InvalidRecord("publication_year is in the future")
+    return title, year, name
+
+
+class AuthorMap:
+    """
+    Author name -> id, loaded once and filled in as the import goes. Unknown
+    names are created with one bulk_create per batch instead of one
+    get_or_create per row.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        for author_id, name in Author.objects.order_by('id').values_list('id', 'name').iterator(chunk_size=10000):
+            # Names aren't unique; like the API, stick with the first author of a name
+            self.ids.setdefault(name, author_id)
+
+    def resolve(self, names):
+        missing = [name for name in dict.fromkeys(names) if name not in self.ids]
+        if missing:
+            created = Author.objects.bulk_create(Author(name=name) for name in missing)
+            if any(author.pk is None for author in created):
+                # Backends that can't return ids from a bulk INSERT
+                created = Author.objects.filter(name__in=missing).order_by('id')
+            new_ids = []
+            for author in created:
+                if author.name not in self.ids:
+                    self.ids[author.name] = author.pk
+                    new_ids.append(author.pk)
+            # bulk_create skips post_save, so record the new authors ourselves
+            changes.record_changes(CatalogChange.AUTHOR, new_ids, CatalogChange.UPSERT)
+        return self.ids
+
+
+class BookImporter:
+    """
+    Stream records from a file into Book rows.
+
+    Every `commit_size` records form one transaction: their authors and
+    books (inserted `batch_size` at a time), the books_bulk_saved signal
+    (search index, cache, change feed) and the source's ImportCheckpoint
+    commit together. Re-running after a crash skips the records the
+    checkpoint already counts.
+    """
+
+    def __init__(self, source, batch_size=DEFAULT_BATCH_SIZE, commit_size=DEFAULT_COMMIT_SIZE, progress=None):
+        self.source = source
+        self.batch_size = batch_size
+        self.commit_size = max(commit_size, batch_size)
+        self.progress = progress or (lambda checkpoint, rate: None)
+        self.errors = []  # (record number, reason) of the first few skipped records
+
+    def run(self, records, restart=False):
+        checkpoint, _ = ImportCheckpoint.objects.get_or_create(source=self.source)
+        if restart:
+            checkpoint.position = checkpoint.imported = checkpoint.skipped = 0
+            checkpoint.finished = False
+            checkpoint.save()
+        if checkpoint.finished:
+            return checkpoint
+
+        # Re-reading the committed prefix is far cheaper than inserting it again
+        records = islice(records, checkpoint.position, None)
+        authors = AuthorMap()
+        start, imported_before = time.perf_counter(), checkpoint.imported
+        for chunk in chunked(records, self.commit_size):
+            with transaction.atomic():
+                self.import_chunk(chunk, authors, checkpoint)
+            elapsed = time.perf_counter() - start
+            self.progress(checkpoint, (checkpoint.imported - imported_before) / elapsed if elapsed else 0.0)
+
+        checkpoint.finished = True
+        checkpoint.save(update_fields=['finished', 'updated_at'])
+        return checkpoint
+
+    def import_chunk(self, records, authors, checkpoint):
+        rows = []
+        for offset, record in enumerate(records, start=checkpoint.position + 1):
+            try:
+                rows.append(clean_record(record))
+            except InvalidRecord as exc:
+                checkpoint.skipped += 1
+                if len(self.errors) < 20:
+                    self.errors.append((offset, str(exc)))
+
+        book_ids = []
+        last_id = Book.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        for batch in chunked(rows, self.batch_size):
+            author_ids = authors.resolve(name for _, _, name in batch)
+            books = Book.objects.bulk_create(
+                Book(title=title, publication_year=year, author_id=author_ids[name])
+                for title, year, name in batch
+            )
+            book_ids.extend(book.pk for book in books)
+        if None in book_ids:
+            # Backends that can't return ids from a bulk INSERT
+            book_ids = list(Book.objects.filter(id__gt=last_id).values_list('id', flat=True))
+        if book_ids:
+            books_bulk_saved.send(sender=Book, book_ids=book_ids)
+
+        checkpoint.position += len(records)
+        checkpoint.imported += len(rows)
+        checkpoint.save()
@@ -0,0 +1,65 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from api.benchmarks import benchmark_database, seed_books
+
+
+class Command(BaseCommand):
+    help = ("Compare /books/ behind a fixed pool of WSGI worker threads with "
+            "/async/books/ on one ASGI event loop, under many slow clients. "
+            "Runs on a throwaway database, never on the real one.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=1000, help="Concurrent requests")
+        parser.add_argument('--workers', type=int, default=8, help="WSGI worker threads")
+        parser.add_argument('--client-delay', type=float, default=0.05,
+                            help="Seconds each client spends sending/reading (slow network)")
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--page-size', type=int, default=20)
+
+    def handle(self, *args, **options):
+        clients, delay = options['clients'], options['client_delay']
+        params = {'page_size': options['page_size'], 'ordering': '-publication_year'}
+
+        # Every client connects at once; latency runs from then to its response,
+        # so time spent queued for a free worker counts too
+
+        def wsgi_request(start):
+            # A sync worker is held for the whole exchange, slow client included
+            time.sleep(delay)
+            Client().get(reverse('book-list'), params)
+            connections.close_all()
+            return time.perf_counter() - start
+
+        async def asgi_request(client, start):
+            # Waiting on the client only parks a coroutine
+            await asyncio.sleep(delay)
+            await client.get(reverse('async-book-list'), params)
+            return time.perf_counter() - start
+
+        def run_wsgi():
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+                return list(pool.map(lambda _: wsgi_request(start), range(clients)))
+
+        async def run_asgi():
+            client, start = AsyncClient(), time.perf_counter()
+            return await asyncio.gather(*(asgi_request(client, start) for _ in range(clients)))
+
+        with benchmark_database(), override_settings(ALLOWED_HOSTS=['testserver']):
+            seed_books(options['rows'])
+            self.stdout.write(f"{clients} clients, {delay * 1000:.0f} ms client delay, "
+                              f"{options['workers']} WSGI workers")
+            self.stdout.write(f"{'path':>6} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+            for name, run in [('WSGI', run_wsgi), ('ASGI', lambda: asyncio.run(run_asgi()))]:
+                start = time.perf_counter()
+                latencies = sorted(run())
+                elapsed = time.perf_counter() - start
+                p50 = statistics.median(latencies) * 1000
+                p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+                self.stdout.write(f"{name:>6} {clients / elapsed:>10,.0f} {p50:>8.0f} {p99:>8.0f}")
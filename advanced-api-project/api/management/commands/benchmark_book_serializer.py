@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.benchmarks import benchmark_database, rows_per_second, seed_books
+from api.fast_serializers import ValuesRepresentation
+from api.models import Book
+from api.serializers import BookSerializer
+from api.utils import chunked
+
+
+class Command(BaseCommand):
+    help = ("Compare rows/sec of BookSerializer against the values() fast path. "
+            "Runs on a throwaway database, never on the real one.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 100000, 1000000])
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help="Rows serialized at once (like one large page)")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        fast = ValuesRepresentation(BookSerializer())
+
+        def serializer_path(queryset):
+            for chunk in chunked(queryset.iterator(chunk_size=chunk_size), chunk_size):
+                BookSerializer(chunk, many=True).data
+
+        def values_path(queryset):
+            for chunk in chunked(fast.values(queryset).iterator(chunk_size=chunk_size), chunk_size):
+                fast.to_representation(chunk)
+
+        with benchmark_database():
+            self.stdout.write(f"{'rows':>10} {'serializer rows/s':>18} {'values() rows/s':>16} {'speedup':>8}")
+            for rows in sorted(options['rows']):
+                seed_books(rows)
+                queryset = Book.objects.order_by('id')[:rows]
+
+                sample = queryset[:chunk_size]
+                if BookSerializer(sample, many=True).data != fast.to_representation(fast.values(sample)):
+                    raise CommandError("The values() path does not match BookSerializer output.")
+
+                slow = rows_per_second(lambda: serializer_path(queryset), rows)
+                quick = rows_per_second(lambda: values_path(queryset), rows)
+                self.stdout.write(f"{rows:>10} {slow:>18,.0f} {quick:>16,.0f} {quick / slow:>7.1f}x")
@@ -0,0 +1,50 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from api import renderers
+from api.benchmarks import benchmark_database, seed_books
+from api.fast_serializers import ValuesRepresentation
+from api.models import Book
+from api.serializers import BookSerializer
+
+
+class Command(BaseCommand):
+    help = ("Compare FastJSONRenderer (orjson) with DRF's JSONRenderer on book list "
+            "payloads. Runs on a throwaway database, never on the real one.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+        parser.add_argument('--repeat', type=int, default=5, help="Best of N renders")
+
+    def best_time(self, renderer, data, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            renderer.render(data)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            raise CommandError("orjson is not installed; FastJSONRenderer is using JSONRenderer.")
+        slow, fast = JSONRenderer(), renderers.FastJSONRenderer()
+        values = ValuesRepresentation(BookSerializer())
+
+        with benchmark_database():
+            self.stdout.write(f"{'rows':>8} {'payload':>10} {'JSONRenderer MB/s':>18} "
+                              f"{'FastJSONRenderer MB/s':>22} {'speedup':>8}")
+            for rows in sorted(options['rows']):
+                seed_books(rows)
+                books = Book.objects.order_by('id')[:rows]
+                # The two shapes our views render: serializer output
+                # (ReturnList of dicts) and the values() fast path
+                for name, data in [('serializer', BookSerializer(books, many=True).data),
+                                   ('values', values.to_representation(values.values(books)))]:
+                    body = slow.render(data)
+                    if fast.render(data) != body:
+                        raise CommandError("FastJSONRenderer output differs from JSONRenderer.")
+                    megabytes = len(body) / 1e6
+                    slow_rate = megabytes / self.best_time(slow, data, options['repeat'])
+                    fast_rate = megabytes / self.best_time(fast, data, options['repeat'])
+                    self.stdout.write(f"{rows:>8} {name:>10} {slow_rate:>18,.1f} "
+                                      f"{fast_rate:>22,.1f} {fast_rate / slow_rate:>7.1f}x")
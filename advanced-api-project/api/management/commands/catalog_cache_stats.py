@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from api.cache import catalog_cache
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss statistics of the catalog response cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Reset the counters after printing them")
+
+    def handle(self, *args, **options):
+        stats = catalog_cache.stats()
+        self.stdout.write(
+            f"version={stats['version']} hits={stats['hits']} misses={stats['misses']} "
+            f"hit_rate={stats['hit_rate']:.1%}"
+        )
+        if options['reset']:
+            catalog_cache.reset_stats()
@@ -0,0 +1,18 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from api import changes
+
+
+class Command(BaseCommand):
+    help = "Remove old delete tombstones from the catalog change feed"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=30,
+                            help="Keep tombstones younger than this; clients offline longer must resync")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        removed = changes.compact(timedelta(days=options['older_than_days']), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed} tombstones; feed compacted through #{changes.compacted_through()}."
+        ))
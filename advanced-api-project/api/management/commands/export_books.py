@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpRequest, QueryDict
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from api import export
+from api.views import BookExportView
+
+
+class Command(BaseCommand):
+    help = "Stream the book catalog to a file as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=export.FORMATS, default='ndjson')
+        parser.add_argument('--output', '-o', help="Output file (default: stdout)")
+        parser.add_argument('--chunk-size', type=int, default=export.DEFAULT_CHUNK_SIZE,
+                            help="Rows fetched per database round trip")
+        parser.add_argument('--filter', action='append', default=[], metavar='NAME=VALUE',
+                            help="Same query parameters as /books/, e.g. --filter author=3 "
+                                 "--filter search=dune --filter ordering=-publication_year")
+
+    def get_queryset(self, filters):
+        # Run the filters through the export view so they behave exactly
+        # like the query parameters of the HTTP endpoints
+        params = QueryDict(mutable=True)
+        for item in filters:
+            name, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f'Filters must look like NAME=VALUE, got "{item}".')
+            params.appendlist(name, value)
+        http_request = HttpRequest()
+        http_request.method = 'GET'
+        http_request.GET = params
+
+        view = BookExportView()
+        view.request = Request(http_request)
+        view.args, view.kwargs, view.format_kwarg = (), {}, None
+        try:
+            return view.filter_queryset(view.get_queryset())
+        except ValidationError as exc:
+            raise CommandError(f'Invalid filter: {exc.detail}')
+
+    def handle(self, *args, **options):
+        queryset = self.get_queryset(options['filter'])
+        chunks = export.iter_export(queryset, options['format'], options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as out:
+                for chunk in chunks:
+                    out.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
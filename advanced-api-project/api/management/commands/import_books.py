@@ -0,0 +1,47 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from api import importer
+
+
+class Command(BaseCommand):
+    help = ("Bulk import books (and their authors) from a CSV or JSON Lines file. "
+            "Columns: title, publication_year, author_name (or author). "
+            "Progress is checkpointed per transaction; re-run the same command to resume.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or - for stdin")
+        parser.add_argument('--format', choices=importer.FORMATS,
+                            help="Default: from the file extension (.jsonl/.ndjson, else csv)")
+        parser.add_argument('--batch-size', type=int, default=importer.DEFAULT_BATCH_SIZE,
+                            help="Books per INSERT")
+        parser.add_argument('--commit-size', type=int, default=importer.DEFAULT_COMMIT_SIZE,
+                            help="Records per transaction and checkpoint")
+        parser.add_argument('--source', help="Checkpoint name (default: the path); required for stdin")
+        parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint and start over")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        source = options['source'] or (None if path == '-' else path)
+        if source is None:
+            raise CommandError("Pass --source to name the checkpoint of a stdin import.")
+        if options['batch_size'] < 1 or options['commit_size'] < 1:
+            raise CommandError("--batch-size and --commit-size must be positive.")
+        fmt = options['format'] or importer.detect_format(path)
+
+        def progress(checkpoint, rate):
+            self.stdout.write(f"{checkpoint.position:>12,} records  {checkpoint.imported:>12,} imported  "
+                              f"{checkpoint.skipped:>8,} skipped  {rate:>10,.0f} books/s")
+
+        books = importer.BookImporter(source, options['batch_size'], options['commit_size'], progress)
+        try:
+            stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        except OSError as exc:
+            raise CommandError(str(exc))
+        with stream:
+            checkpoint = books.run(importer.iter_records(stream, fmt), restart=options['restart'])
+
+        for record, reason in books.errors:
+            self.stderr.write(f"Skipped record {record}: {reason}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{source}: {checkpoint.imported:,} books imported, {checkpoint.skipped:,} records skipped."
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from api import search
+from api.cache import catalog_cache
+
+
+class Command(BaseCommand):
+    help = "Rebuild the FTS5 search index for all books"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help="Books indexed per INSERT ... SELECT statement")
+
+    def handle(self, *args, **options):
+        if not search.fts_available():
+            self.stdout.write("Full-text search index is only available on SQLite; nothing to do.")
+            return
+        indexed = search.rebuild_index(batch_size=options['batch_size'])
+        # Cached search results may have been computed from the old index
+        catalog_cache.bump()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} books."))
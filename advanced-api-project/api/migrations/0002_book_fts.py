@@ -0,0 +1,36 @@
+# FTS5 search index for Book (title + author name), SQLite only
+
+from django.db import migrations
+
+FTS_TABLE = 'api_book_fts'
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "title, author, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    # Index the books that already exist
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, title, author) "
+        "SELECT b.id, b.title, a.name FROM api_book b JOIN api_author a ON a.id = b.author_id"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+from django.utils import timezone
+
+
+def backfill_change_feed(apps, schema_editor):
+    # Give every existing book and author an upsert entry, so a full sync
+    # (?since=0) returns the catalog as it was before the feed existed.
+    # Objects that already have an entry keep it.
+    now = schema_editor.connection.ops.adapt_datetimefield_value(timezone.now())
+    for kind, table in [('author', 'api_author'), ('book', 'api_book')]:
+        schema_editor.execute(
+            "INSERT INTO api_catalogchange (kind, object_id, action, changed_at) "
+            f"SELECT %s, t.id, %s, %s FROM {table} t "
+            "WHERE NOT EXISTS (SELECT 1 FROM api_catalogchange c WHERE c.kind = %s AND c.object_id = t.id) "
+            "ORDER BY t.id",
+            [kind, 'upsert', now, kind],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_change_feed, migrations.RunPython.noop),
+    ]
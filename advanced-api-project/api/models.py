@@ -16,8 +16,74 @@ class Author(models.Model):
 class Book(models.Model):
     title = models.CharField(max_length=200)           # Book title
     publication_year = models.IntegerField()           # Year book was published
-    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books')
+    # db_index=False: the (author, publication_year) index below covers author lookups
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books', db_index=False)
     # related_name='books' lets us access author.books to get all books for that author
 
+    class Meta:
+        # One index per access path of BookListView (filterset_fields / ordering_fields);
+        # see test_query_plans.py
+        indexes = [
+            models.Index(fields=['author', 'publication_year'], name='book_author_year_idx'),  # ?author=[&publication_year=]
+            models.Index(fields=['publication_year', 'title'], name='book_year_title_idx'),  # ?publication_year=, ordering by year
+            models.Index(fields=['title'], name='book_title_idx'),  # ?title=, default ordering by title
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.publication_year})"
+
+
+# Change feed entry: the latest change of one Book or Author row.
+# `seq` (the primary key, AUTOINCREMENT on SQLite) grows with every write
+# and is never reused, so clients sync with ?since=<last seq they saw>.
+class CatalogChange(models.Model):
+    BOOK = 'book'
+    AUTHOR = 'author'
+    KIND_CHOICES = [(BOOK, 'Book'), (AUTHOR, 'Author')]
+
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTION_CHOICES = [(UPSERT, 'Created or updated'), (DELETE, 'Deleted')]
+
+    seq = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # Older entries of a row are replaced, so the feed size follows the catalog size
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='catalog_change_object_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['action', 'changed_at'], name='catalog_change_tombstone_idx'),  # compaction
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} {self.action} {self.kind} {self.object_id}"
+
+
+# One row per compaction run: deletions up to `compacted_through` are gone
+# from the feed, so clients that synced before that point must resync.
+class ChangeFeedCompaction(models.Model):
+    compacted_through = models.BigIntegerField()
+    compacted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"compacted through #{self.compacted_through}"
+
+
+# Progress of one `import_books` source. Saved in the same transaction as
+# the rows it counts, so a crashed import resumes right after the last
+# committed chunk instead of importing rows twice.
+class ImportCheckpoint(models.Model):
+    source = models.CharField(max_length=255, unique=True)
+    position = models.BigIntegerField(default=0)  # Input records consumed
+    imported = models.BigIntegerField(default=0)
+    skipped = models.BigIntegerField(default=0)
+    finished = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source}: {self.position} records"
@@ -0,0 +1,256 @@
+# api/pagination.py
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from .counts import estimate_book_count
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (a.k.a. seek) pagination.
+
+    The cursor stores the ordering values of the last row on the page, and the
+    next page is fetched with `WHERE (ordering columns) > (cursor values)`
+    instead of an OFFSET. Every page costs the same as the first one and no
+    COUNT(*) is needed. Whatever ordering the view (or OrderingFilter) chose is
+    used, with `id` appended as a tiebreaker so the order is always total.
+
+    Clients that want a total ask for it with ?count=true. It is exact up to
+    `count_threshold` and approximate above (see get_count()), so it never
+    costs more than reading `count_threshold` rows.
+    """
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    tiebreaker = 'id'
+    count_query_param = 'count'
+    count_threshold = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.finish_page(list(self.page_queryset(queryset, request)))
+
+    def page_queryset(self, queryset, request):
+        """
+        The (lazy) queryset for the requested page, one row longer than the
+        page to tell whether there is another one. Split from finish_page()
+        so async views can fetch the rows with the async ORM.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.ordering_fields = self.get_ordering_fields(queryset)
+
+        # Counted on the filtered queryset, before seeking to the page
+        self.count = self.count_approximate = None
+        if self.count_requested(request):
+            self.count, self.count_approximate = self.get_count(queryset)
+
+        cursor = self.decode_cursor(request)
+        self.cursor = cursor
+        self.reverse = bool(cursor and cursor['r'])
+
+        if cursor is not None:
+            queryset = queryset.filter(self.seek_filter(cursor['v'], self.reverse))
+        if self.reverse:
+            queryset = queryset.order_by(*[self.flip(field) for field in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        return queryset[:self.page_size + 1]
+
+    def finish_page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def count_requested(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def get_count(self, queryset):
+        """
+        (count, approximate). The capped COUNT stops after count_threshold + 1
+        rows; at or below the threshold it is the exact count. Above it the
+        count comes from estimate_count(), or is count_threshold + 1 (a lower
+        bound) when there is no estimate.
+        """
+        threshold = self.get_count_threshold()
+        capped = queryset.order_by()[:threshold + 1].count()
+        if capped <= threshold:
+            return capped, False
+        return max(self.estimate_count(queryset) or 0, capped), True
+
+    def get_count_threshold(self):
+        return self.count_threshold
+
+    def estimate_count(self, queryset):
+        # Subclasses can estimate large counts from statistics
+        return None
+
+    def get_ordering(self, queryset):
+        # Reuse the ordering already applied by OrderingFilter / Meta.ordering
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or [])
+        ordering = ['id' if field == 'pk' else '-id' if field == '-pk' else field for field in ordering]
+        if self.tiebreaker not in [field.lstrip('-') for field in ordering]:
+            ordering.append(self.tiebreaker)
+        return ordering
+
+    def get_ordering_fields(self, queryset):
+        # The model field (or annotation's output field) behind each ordering column
+        fields = []
+        for name in (field.lstrip('-') for field in self.ordering):
+            if name in queryset.query.annotations:
+                fields.append(queryset.query.annotations[name].output_field)
+                continue
+            model = queryset.model
+            parts = name.split(LOOKUP_SEP)
+            for part in parts[:-1]:
+                model = model._meta.get_field(part).related_model
+            fields.append(model._meta.get_field(parts[-1]))
+        return fields
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    def seek_filter(self, values, reverse=False):
+        # (a, b, c) > (x, y, z)  ==>  a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        condition = Q()
+        equal_so_far = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal_so_far & Q(**{f'{name}__{lookup}': value})
+            equal_so_far &= Q(**{name: value})
+        # Redundant bound on the leading column: lets the database range-scan
+        # the index in order and stop at LIMIT instead of sorting an OR union
+        first = self.ordering[0]
+        bound = 'lte' if first.startswith('-') != reverse else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{bound}': values[0]}) & condition
+
+    def row_values(self, row):
+        names = [field.lstrip('-') for field in self.ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, name) for name in names]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            # A cursor only makes sense for the ordering it was made for
+            if cursor['o'] != self.ordering:
+                raise ValueError
+            if not isinstance(cursor['v'], list) or len(cursor['v']) != len(self.ordering):
+                raise ValueError
+            cursor['v'] = [self.clean_value(field, value) for field, value in zip(self.ordering_fields, cursor['v'])]
+            cursor['r'] = bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    @staticmethod
+    def clean_value(field, value):
+        # Only scalars, converted like the column's own values; NULLs can't be seeked past
+        if value is None or not isinstance(value, (str, int, float)):
+            raise ValueError
+        value = field.to_python(value)
+        if value is None:
+            raise ValueError
+        return value
+
+    def encode_cursor(self, values, reverse=False):
+        data = json.dumps({'o': self.ordering, 'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        encoded = urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.row_values(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.row_values(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+        if self.count is not None:
+            response['count'] = self.count
+            response['count_approximate'] = self.count_approximate
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer', 'description': 'Only with ?count=true'},
+                'count_approximate': {'type': 'boolean', 'description': 'Only with ?count=true'},
+                'results': schema,
+            },
+        }
+
+
+class BookKeysetPagination(KeysetPagination):
+    page_size = 20
+    max_page_size = 100
+
+    def get_count_threshold(self):
+        # Read per request, so settings changes (and override_settings) apply
+        return getattr(settings, 'BOOK_COUNT', {}).get('THRESHOLD', self.count_threshold)
+
+    def estimate_count(self, queryset):
+        # Per-author / per-year book counts, cached (see counts.py)
+        return estimate_book_count(self.request.query_params)
+
+
+class AuthorBookKeysetPagination(BookKeysetPagination):
+    """For /authors/<pk>/books/, which is filtered by the URL, not by query parameters."""
+
+    def estimate_count(self, queryset):
+        return estimate_book_count({'author': self.request.parser_context['kwargs']['pk']})
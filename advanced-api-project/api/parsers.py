@@ -0,0 +1,15 @@
+# api/parsers.py
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from .renderers import msgpack
+
+
+class MessagePackParser(BaseParser):
+    """Request bodies sent as `Content-Type: application/msgpack`."""
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, TypeError) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
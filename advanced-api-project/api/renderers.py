@@ -0,0 +1,58 @@
+# api/renderers.py
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Optional: without it FastJSONRenderer is plain JSONRenderer
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional: without it MessagePack is simply not offered
+    msgpack = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on top of orjson, which encodes straight to bytes in C and
+    walks ReturnList / ReturnDict / OrderedDict as the list / dict they
+    subclass. Output is the same as JSONRenderer's (compact, UTF-8);
+    indented output (browsable API, `; indent=`) and non-default
+    COMPACT_JSON / UNICODE_JSON settings go through JSONRenderer.
+
+    Use it per view with `renderer_classes = [FastJSONRenderer, ...]` or for
+    every view through REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].
+    """
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    # Anything orjson can't encode natively (lazy strings, Decimal, datetimes
+    # with DRF's formatting, ...) gets the same conversion as in JSONRenderer
+    default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or not self.compact or self.ensure_ascii
+                or self.get_indent(accepted_media_type or '', renderer_context or {})):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self.default, option=self.options)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Binary MessagePack for machine clients (`Accept: application/msgpack`):
+    smaller than JSON and cheaper to decode. Values without a MessagePack
+    type (Decimal, datetimes, lazy strings, ...) are converted like in JSON.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self.default, use_bin_type=True)
@@ -0,0 +1,116 @@
+# api/search.py
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+from rest_framework.settings import api_settings
+from .models import Author, Book
+
+# SQLite FTS5 table holding one row per Book (rowid = book id)
+FTS_TABLE = 'api_book_fts'
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+ID_CHUNK_SIZE = 500
+
+
+def fts_available():
+    # The FTS table is only created by the migration on SQLite
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(terms):
+    # Quote every term so user input can't inject FTS5 syntax, and match
+    # prefixes like SearchFilter's icontains does ("djan" finds "Django")
+    return ' '.join('"%s"*' % term.replace('"', '""') for term in terms)
+
+
+def _chunks(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), ID_CHUNK_SIZE):
+        yield ids[start:start + ID_CHUNK_SIZE]
+
+
+def _index_sql(where):
+    return (
+        f'INSERT OR REPLACE INTO {FTS_TABLE} (rowid, title, author) '
+        f'SELECT b.id, b.title, a.name FROM {Book._meta.db_table} b '
+        f'JOIN {Author._meta.db_table} a ON a.id = b.author_id '
+        f'WHERE {where}'
+    )
+
+
+def index_books(book_ids):
+    """(Re)index the given books, e.g. after a save."""
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(book_ids):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(_index_sql(f'b.id IN ({placeholders})'), chunk)
+
+
+def unindex_books(book_ids):
+    """Drop the given books from the index, e.g. after a delete."""
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(book_ids):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', chunk)
+
+
+def reindex_author(author_id):
+    """Refresh the author name on every indexed book of one author."""
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(_index_sql('b.author_id = %s'), [author_id])
+
+
+def rebuild_index(batch_size=10000):
+    """Rebuild the whole index from api_book in id-range batches. Returns the row count."""
+    if not fts_available():
+        return 0
+    indexed = 0
+    last_id = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        while True:
+            ids = list(
+                Book.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            cursor.execute(_index_sql('b.id BETWEEN %s AND %s'), [ids[0], ids[-1]])
+            indexed += len(ids)
+            last_id = ids[-1]
+        # Merge the b-trees written by the batches into one
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+    return indexed
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter backed by the FTS5 index instead of LIKE '%term%' scans.
+
+    Matching books are joined to the index and annotated with their bm25
+    relevance as `search_rank` (lower is better). Unless the client asked
+    for an explicit ?ordering=, results are sorted by relevance, so this
+    backend should come after OrderingFilter in `filter_backends`.
+    Falls back to the regular SearchFilter on other databases.
+    """
+    rank_field = 'search_rank'
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms or not fts_available():
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE} MATCH %s', f'{FTS_TABLE}.rowid = {Book._meta.db_table}.id'],
+            params=[build_match_query(search_terms)],
+        ).annotate(**{self.rank_field: RawSQL(f'bm25({FTS_TABLE})', [])})
+
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by(self.rank_field)
+        return queryset
@@ -1,9 +1,92 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from .models import Author, Book
 from datetime import date
 
+
+def parse_fieldset(value):
+    # "id,books.title,books.id" -> {'id': {}, 'books': {'title': {}, 'id': {}}}
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for part in path.strip().split('.'):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+class SparseFieldsetMixin:
+    """
+    Trim the output of a read with ?fields=a,b or ?exclude=c. Dotted names
+    (books.title) reach into nested serializers. Only the top-level
+    serializer reads the request; it hands the nested part of the fieldset
+    down to its nested serializers. Writes always use every field.
+    """
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+
+    def get_sparse_fieldset(self):
+        if hasattr(self, '_sparse_fieldset'):
+            return self._sparse_fieldset
+        request = self.context.get('request')
+        # many=True wraps the top-level serializer in a ListSerializer
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None or request is None or request.method not in SAFE_METHODS:
+            return None, None
+        include = request.query_params.get(self.fields_query_param)
+        exclude = request.query_params.get(self.exclude_query_param)
+        return (parse_fieldset(include) if include else None,
+                parse_fieldset(exclude) if exclude else None)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        include, exclude = self.get_sparse_fieldset()
+        if include is None and exclude is None:
+            return fields
+
+        trimmed = {}
+        for name, field in fields.items():
+            if include is not None and name not in include:
+                continue
+            sub_include = include.get(name) if include is not None else None
+            sub_exclude = exclude.get(name) if exclude is not None else None
+            if sub_exclude == {}:
+                continue
+            nested = getattr(field, 'child', field)
+            if isinstance(nested, SparseFieldsetMixin):
+                nested._sparse_fieldset = (sub_include or None, sub_exclude or None)
+            trimmed[name] = field
+        return trimmed
+
+
+def only_fields(serializer, always=()):
+    """
+    Model fields the serializer actually reads, for queryset.only(). Nested
+    serializers are left to their own (prefetch) query. Returns None when a
+    field reads something that isn't a plain model field.
+    """
+    model = serializer.Meta.model
+    names = {model._meta.pk.name, *always}
+    for field in serializer.fields.values():
+        if isinstance(field, serializers.BaseSerializer) or field.write_only:
+            continue
+        if field.source == '*' or len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if model_field.concrete:
+            names.add(field.source)
+    return names
+
+
 # Serializer for Book model
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = '__all__'  # Serialize all fields: title, publication_year, author
@@ -17,11 +100,95 @@ class BookSerializer(serializers.ModelSerializer):
 
 
 # Serializer for Author model with nested BookSerializer
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # Use BookSerializer to display books linked to the author
     books = BookSerializer(many=True, read_only=True)
 
     class Meta:
         model = Author
-        fields = ['name', 'books']
+        fields = ['id', 'name', 'books']
+
+
+class AuthorSummarySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    # Annotated by the view (Count / Max over the author's books), not nested
+    book_count = serializers.IntegerField(read_only=True)
+    latest_publication_year = serializers.IntegerField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = Author
+        fields = ['id', 'name', 'book_count', 'latest_publication_year']
+
+
+# --- Bulk writes -----------------------------------------------------------
+class PrefetchedAuthorField(serializers.PrimaryKeyRelatedField):
+    """
+    Author FK field that resolves ids from the map BookBulkListSerializer
+    loaded with a single IN query, instead of one SELECT per row.
+    """
+
+    def to_internal_value(self, data):
+        authors = self.context.get('authors')
+        if authors is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            author = authors.get(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if author is None:
+            self.fail('does_not_exist', pk_value=data)
+        return author
+
+
+class BookBulkListSerializer(serializers.ListSerializer):
+    """
+    Validates a list of books in one pass and writes them with
+    bulk_create / bulk_update in batches of context['batch_size'].
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            author_ids = set()
+            for item in data:
+                try:
+                    author_ids.add(int(item['author']))
+                except (KeyError, TypeError, ValueError):
+                    pass
+            authors = Author.objects.all()
+            if transaction.get_connection().in_atomic_block:
+                # BookBulkView validates and saves in one transaction: keep
+                # these authors from being deleted before the rows are written
+                authors = authors.select_for_update()
+            self.context['authors'] = authors.in_bulk(author_ids)
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        # For updates self.instance maps book id -> Book
+        if self.instance is not None:
+            self.child.instance = self.instance.get(data.get('id')) if isinstance(data, dict) else None
+        return super().run_child_validation(data)
+
+    def create(self, validated_data):
+        books = [Book(**attrs) for attrs in validated_data]
+        return Book.objects.bulk_create(books, batch_size=self.context.get('batch_size'))
+
+    def update(self, instance, validated_data):
+        books = []
+        fields = set()
+        for item, attrs in zip(self.initial_data, validated_data):
+            book = instance[int(item['id'])]
+            for name, value in attrs.items():
+                setattr(book, name, value)
+                fields.add(name)
+            books.append(book)
+        if fields:
+            Book.objects.bulk_update(books, sorted(fields), batch_size=self.context.get('batch_size'))
+        return books
+
+
+class BookBulkSerializer(BookSerializer):
+    author = PrefetchedAuthorField(queryset=Author.objects.all())
 
+    class Meta(BookSerializer.Meta):
+        list_serializer_class = BookBulkListSerializer
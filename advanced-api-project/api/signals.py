@@ -0,0 +1,72 @@
+# api/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from . import changes, search
+from .cache import catalog_cache
+from .models import Author, Book, CatalogChange
+
+# Sent with `book_ids` after bulk_create / bulk_update, which skip post_save
+books_bulk_saved = Signal()
+
+
+# Keep the FTS5 search index in sync with Book / Author writes
+@receiver(post_save, sender=Book)
+def index_saved_book(sender, instance, **kwargs):
+    search.index_books([instance.pk])
+
+
+@receiver(books_bulk_saved)
+def index_bulk_saved_books(sender, book_ids, **kwargs):
+    search.index_books(book_ids)
+
+
+@receiver(post_delete, sender=Book)
+def unindex_deleted_book(sender, instance, **kwargs):
+    search.unindex_books([instance.pk])
+
+
+@receiver(post_save, sender=Author)
+def reindex_renamed_author(sender, instance, created, **kwargs):
+    # A new author has no books yet; deleting one cascades to Book post_delete
+    if not created:
+        search.reindex_author(instance.pk)
+
+
+# Any catalog write invalidates every cached listing. Bump right away so the
+# writer never reads its own stale listing, and again after commit so no
+# concurrent reader keeps the pre-commit state cached under the new version.
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(books_bulk_saved)
+def bump_catalog_version(sender, **kwargs):
+    catalog_cache.bump()
+    transaction.on_commit(catalog_cache.bump)
+
+
+# Record every write in the change feed (/changes/?since=<seq>)
+@receiver(post_save, sender=Book)
+def record_saved_book(sender, instance, **kwargs):
+    changes.record_changes(CatalogChange.BOOK, [instance.pk], CatalogChange.UPSERT)
+
+
+@receiver(books_bulk_saved)
+def record_bulk_saved_books(sender, book_ids, **kwargs):
+    changes.record_changes(CatalogChange.BOOK, book_ids, CatalogChange.UPSERT)
+
+
+@receiver(post_delete, sender=Book)
+def record_deleted_book(sender, instance, **kwargs):
+    changes.record_changes(CatalogChange.BOOK, [instance.pk], CatalogChange.DELETE)
+
+
+@receiver(post_save, sender=Author)
+def record_saved_author(sender, instance, **kwargs):
+    changes.record_changes(CatalogChange.AUTHOR, [instance.pk], CatalogChange.UPSERT)
+
+
+@receiver(post_delete, sender=Author)
+def record_deleted_author(sender, instance, **kwargs):
+    changes.record_changes(CatalogChange.AUTHOR, [instance.pk], CatalogChange.DELETE)
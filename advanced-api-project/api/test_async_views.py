@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.test import TransactionTestCase
+from django.urls import reverse
+from .models import Author, Book
+
+
+class AsyncBookViewTests(TransactionTestCase):
+    # The async ORM runs queries in another thread, outside TestCase's transaction
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name="Ann Leckie")
+        self.other = Author.objects.create(name="Martha Wells")
+        for i, title in enumerate(["Ancillary Justice", "Ancillary Sword", "Ancillary Mercy"]):
+            Book.objects.create(title=title, publication_year=2013 + i, author=self.author)
+        self.book = Book.objects.create(title="All Systems Red", publication_year=2017, author=self.other)
+
+    async def test_list_matches_sync_view(self):
+        for params in [
+            {},
+            {'ordering': '-publication_year', 'page_size': 2},
+            {'author': self.author.pk, 'search': 'ancillary', 'fields': 'id,title'},
+        ]:
+            sync_response = await self.async_client.get(reverse('book-list'), params)
+            async_response = await self.async_client.get(reverse('async-book-list'), params)
+            self.assertEqual(async_response.status_code, 200)
+            self.assertEqual(async_response.json()['results'], sync_response.json()['results'], params)
+
+    async def test_list_pagination(self):
+        response = (await self.async_client.get(reverse('async-book-list'), {'page_size': 3})).json()
+        self.assertEqual(len(response['results']), 3)
+        rest = (await self.async_client.get(response['next'])).json()
+        self.assertEqual([row['title'] for row in rest['results']], ["Ancillary Sword"])
+
+    async def test_invalid_filter(self):
+        response = await self.async_client.get(reverse('async-book-list'), {'author': 999})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_detail(self):
+        response = await self.async_client.get(reverse('async-book-detail', kwargs={'pk': self.book.pk}))
+        self.assertEqual(response.json()['title'], "All Systems Red")
+        response = await self.async_client.get(reverse('async-book-detail', kwargs={'pk': 999}))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,90 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Author, Book
+
+
+class AuthorAPITests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.authors = [Author.objects.create(name=f"Author {i}") for i in range(5)]
+        for author in self.authors:
+            for year in range(1990, 1994):
+                Book.objects.create(title=f"{author.name} {year}", publication_year=year, author=author)
+        self.list_url = reverse('author-list')
+
+    def test_books_loaded_with_one_prefetch_query(self):
+        # One query for the authors, one for all of their books
+        with self.assertNumQueries(2):
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertTrue(all(len(row['books']) == 4 for row in response.data['results']))
+
+    def test_books_limit_caps_nested_books(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.list_url, {'books_limit': 2})
+        for row in response.data['results']:
+            self.assertEqual([book['publication_year'] for book in row['books']], [1990, 1991])
+
+    def test_invalid_books_limit(self):
+        response = self.client.get(self.list_url, {'books_limit': 'lots'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_author_detail(self):
+        author = self.authors[0]
+        response = self.client.get(reverse('author-detail', kwargs={'pk': author.pk}), {'books_limit': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], author.name)
+        self.assertEqual(len(response.data['books']), 1)
+
+
+class AuthorSummaryTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.prolific = Author.objects.create(name="Agatha Christie")
+        self.debut = Author.objects.create(name="Bram Stoker")
+        self.unpublished = Author.objects.create(name="Carl Unknown")
+        for year in [1920, 1926, 1934]:
+            Book.objects.create(title=f"Mystery {year}", publication_year=year, author=self.prolific)
+        Book.objects.create(title="Dracula", publication_year=1897, author=self.debut)
+
+    def test_summary_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('author-summary'))
+        self.assertEqual(response.data['results'], [
+            {'id': self.prolific.pk, 'name': "Agatha Christie", 'book_count': 3, 'latest_publication_year': 1934},
+            {'id': self.debut.pk, 'name': "Bram Stoker", 'book_count': 1, 'latest_publication_year': 1897},
+            {'id': self.unpublished.pk, 'name': "Carl Unknown", 'book_count': 0, 'latest_publication_year': None},
+        ])
+
+    def test_summary_pages_by_book_count(self):
+        first = self.client.get(reverse('author-summary'), {'ordering': '-book_count', 'page_size': 2}).data
+        second = self.client.get(first['next']).data
+        self.assertEqual([row['book_count'] for row in first['results'] + second['results']], [3, 1, 0])
+
+    def test_author_books(self):
+        url = reverse('author-books', kwargs={'pk': self.prolific.pk})
+        first = self.client.get(url, {'page_size': 2}).data
+        second = self.client.get(first['next']).data
+        years = [row['publication_year'] for row in first['results'] + second['results']]
+        self.assertEqual(years, [1920, 1926, 1934])
+        self.assertEqual(self.client.get(url, {'ordering': '-title'}).data['results'][0]['title'], "Mystery 1934")
+
+    @override_settings(BOOK_COUNT={'THRESHOLD': 1, 'STATS_TIMEOUT': 600})
+    def test_author_books_count_is_estimated_for_that_author(self):
+        url = reverse('author-books', kwargs={'pk': self.prolific.pk})
+        # A stray ?author= doesn't change whose books are counted
+        for params in [{}, {'author': self.debut.pk}]:
+            data = self.client.get(url, {'count': 'true', **params}).data
+            self.assertEqual((data['count'], data['count_approximate']), (3, True), params)
+
+    def test_author_books_unknown_author(self):
+        response = self.client.get(reverse('author-books', kwargs={'pk': 999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        empty = self.client.get(reverse('author-books', kwargs={'pk': self.unpublished.pk}))
+        self.assertEqual(empty.data['results'], [])
@@ -0,0 +1,39 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Author, Book
+
+
+class BookBatchTests(APITestCase):
+
+    def setUp(self):
+        author = Author.objects.create(name="Becky Chambers")
+        self.books = [
+            Book.objects.create(title=title, publication_year=2014 + i, author=author)
+            for i, title in enumerate(["The Long Way", "A Closed and Common Orbit", "Record of a Spaceborn Few"])
+        ]
+        self.url = reverse('book-batch')
+
+    def test_get_returns_requested_order_in_one_query(self):
+        a, b, c = (book.pk for book in self.books)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'ids': f'{c},{a},999,{b},{a}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data['results']], [c, a, b])
+        self.assertEqual(response.data['missing'], [999])
+
+    def test_post_body(self):
+        response = self.client.post(self.url, {'ids': [self.books[1].pk]}, format='json')
+        self.assertEqual(response.data['results'][0]['title'], "A Closed and Common Orbit")
+        self.assertEqual(response.data['missing'], [])
+
+    def test_sparse_fields(self):
+        response = self.client.get(self.url, {'ids': str(self.books[0].pk), 'fields': 'title'})
+        self.assertEqual(response.data['results'], [{'title': "The Long Way"}])
+
+    @override_settings(BOOK_BATCH_MAX_IDS=2)
+    def test_invalid_and_oversized_batches(self):
+        for params in [{'ids': ''}, {'ids': '1,x'}, {'ids': '1,2,3'}]:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
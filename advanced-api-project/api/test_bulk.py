@@ -0,0 +1,82 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Author, Book
+
+
+class BookBulkTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="ingest", password="ingestpass")
+        self.client.force_authenticate(self.user)
+        self.author = Author.objects.create(name="Octavia E. Butler")
+        self.other = Author.objects.create(name="N. K. Jemisin")
+        self.url = reverse('book-bulk')
+
+    def test_bulk_create(self):
+        rows = [{'title': f"Book {i}", 'publication_year': 2000 + i, 'author': self.author.pk} for i in range(5)]
+        # authors IN query + 3 INSERTs (batch_size=2) + search index
+        # + change feed (delete/insert) + savepoint/release
+        with self.assertNumQueries(9):
+            response = self.client.post(self.url + '?batch_size=2', rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 5)
+        self.assertTrue(all(row['id'] for row in response.data))
+        self.assertEqual(Book.objects.count(), 5)
+
+    def test_bulk_create_checks_authors_inside_the_transaction(self):
+        rows = [{'title': "Kindred", 'publication_year': 1979, 'author': self.author.pk}]
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(self.url, rows, format='json')
+        sql = [q['sql'] for q in ctx.captured_queries]
+        savepoint = next(i for i, q in enumerate(sql) if q.startswith('SAVEPOINT'))
+        authors = next(i for i, q in enumerate(sql) if 'FROM "api_author"' in q)
+        self.assertLess(savepoint, authors)
+
+    def test_bulk_create_reports_errors_per_row_and_writes_nothing(self):
+        rows = [
+            {'title': "Fine", 'publication_year': 1993, 'author': self.author.pk},
+            {'title': "Future", 'publication_year': 9999, 'author': self.author.pk},
+            {'title': "Nobody", 'publication_year': 1990, 'author': 999},
+        ]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data['errors']
+        self.assertEqual([row['index'] for row in errors], [1, 2])
+        self.assertIn('publication_year', errors[0]['errors'])
+        self.assertIn('author', errors[1]['errors'])
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_bulk_update(self):
+        books = [Book.objects.create(title=f"Old {i}", publication_year=1980, author=self.author) for i in range(3)]
+        rows = [{'id': book.pk, 'title': f"New {i}"} for i, book in enumerate(books)]
+        rows[0]['author'] = self.other.pk
+        response = self.client.patch(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(Book.objects.order_by('id').values_list('title', 'author_id')),
+            [("New 0", self.other.pk), ("New 1", self.author.pk), ("New 2", self.author.pk)],
+        )
+
+    def test_bulk_update_unknown_id(self):
+        book = Book.objects.create(title="Kindred", publication_year=1979, author=self.author)
+        rows = [{'id': book.pk, 'title': "Kindred (2nd ed.)"}, {'id': 12345, 'title': "Ghost"}, {'title': "No id"}]
+        response = self.client.patch(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([row['index'] for row in response.data['errors']], [1, 2])
+        book.refresh_from_db()
+        self.assertEqual(book.title, "Kindred")
+
+    def test_bulk_writes_update_search_index(self):
+        rows = [{'title': "Parable of the Sower", 'publication_year': 1993, 'author': self.author.pk}]
+        self.client.post(self.url, rows, format='json')
+        response = self.client.get(reverse('book-list'), {'search': 'sower'})
+        self.assertEqual([row['title'] for row in response.data['results']], ["Parable of the Sower"])
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.post(self.url, [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .cache import catalog_cache
+from .models import Author, Book
+
+
+class CatalogCacheTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name="Ursula K. Le Guin")
+        self.book = Book.objects.create(title="The Dispossessed", publication_year=1974, author=self.author)
+        self.list_url = reverse('book-list')
+
+    def test_repeated_listing_is_served_from_cache(self):
+        first = self.client.get(self.list_url, {'publication_year': 1974, 'ordering': 'title'})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        # Same combination, different parameter order and an empty filter
+        with self.assertNumQueries(0):
+            second = self.client.get(self.list_url + '?ordering=title&author=&publication_year=1974')
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+        stats = catalog_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_other_parameters_miss(self):
+        self.client.get(self.list_url, {'ordering': 'title'})
+        response = self.client.get(self.list_url, {'ordering': '-title'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_book_and_author_writes_invalidate(self):
+        self.client.get(self.list_url)
+        Book.objects.create(title="The Lathe of Heaven", publication_year=1971, author=self.author)
+        response = self.client.get(self.list_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), 2)
+
+        self.author.name = "Ursula Le Guin"
+        self.author.save()
+        self.assertEqual(self.client.get(self.list_url)['X-Cache'], 'MISS')
+
+    def test_version_bumped_again_on_commit(self):
+        version = catalog_cache.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.delete()
+        self.assertEqual(catalog_cache.version(), version + 2)
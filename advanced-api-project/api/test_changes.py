@@ -0,0 +1,96 @@
+import io
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from . import changes
+from .models import Author, Book, CatalogChange, ChangeFeedCompaction
+
+
+class ChangeFeedTests(APITestCase):
+
+    def setUp(self):
+        self.author = Author.objects.create(name="Connie Willis")
+        self.book = Book.objects.create(title="Doomsday Book", publication_year=1992, author=self.author)
+        self.url = reverse('change-feed')
+
+    def feed(self, since, **params):
+        response = self.client.get(self.url, {'since': since, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_full_sync_then_delta(self):
+        data = self.feed(0)
+        self.assertEqual([row['title'] for row in data['books']['changed']], ["Doomsday Book"])
+        self.assertEqual(data['authors']['changed'], [{'id': self.author.pk, 'name': "Connie Willis"}])
+        since = data['next_since']
+
+        self.assertEqual(self.feed(since)['books']['changed'], [])
+
+        other = Book.objects.create(title="Passage", publication_year=2001, author=self.author)
+        deleted_id = self.book.pk
+        self.book.delete()
+        data = self.feed(since)
+        self.assertEqual([row['id'] for row in data['books']['changed']], [other.pk])
+        self.assertEqual(data['books']['deleted'], [deleted_id])
+        self.assertEqual(data['authors']['changed'], [])
+
+    def test_repeated_updates_are_one_entry(self):
+        for year in range(1993, 2000):
+            self.book.publication_year = year
+            self.book.save()
+        self.assertEqual(CatalogChange.objects.filter(kind=CatalogChange.BOOK).count(), 1)
+        self.assertGreater(changes.latest_seq(), 2)
+
+    def test_bulk_writes_are_recorded(self):
+        user = User.objects.create_user(username="ingest")
+        self.client.force_authenticate(user)
+        since = changes.latest_seq()
+        rows = [{'title': "To Say Nothing of the Dog", 'publication_year': 1997, 'author': self.author.pk}]
+        self.client.post(reverse('book-bulk'), rows, format='json')
+        data = self.feed(since)
+        self.assertEqual([row['title'] for row in data['books']['changed']], ["To Say Nothing of the Dog"])
+
+    def test_paging(self):
+        for i in range(4):
+            Book.objects.create(title=f"Story {i}", publication_year=2000, author=self.author)
+        first = self.feed(0, limit=3)
+        self.assertTrue(first['has_more'])
+        second = self.feed(first['next_since'], limit=3)
+        self.assertFalse(second['has_more'])
+        self.assertEqual(len(first['books']['changed']) + len(second['books']['changed']), 5)
+
+    def test_compaction_forces_resync(self):
+        since = changes.latest_seq()
+        doomed = Book.objects.create(title="Bellwether", publication_year=1996, author=self.author)
+        doomed.delete()
+        call_command('compact_change_feed', older_than_days=0, stdout=io.StringIO())
+        self.assertFalse(CatalogChange.objects.filter(action=CatalogChange.DELETE).exists())
+        response = self.client.get(self.url, {'since': since})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        # A full resync still works
+        self.assertEqual(len(self.feed(0)['books']['changed']), 1)
+
+    def test_watermark_covers_every_removed_tombstone(self):
+        for i in range(3):
+            Book.objects.create(title=f"Book {i}", publication_year=2000, author=self.author).delete()
+        tombstones = list(CatalogChange.objects.filter(action=CatalogChange.DELETE).order_by('seq'))
+        # Crash while compacting the second batch (on advancing the watermark)
+        save = ChangeFeedCompaction.save
+
+        def crash_on_update(watermark, *args, **kwargs):
+            if watermark.pk is not None:
+                raise RuntimeError
+            return save(watermark, *args, **kwargs)
+
+        with mock.patch.object(ChangeFeedCompaction, 'save', autospec=True, side_effect=crash_on_update):
+            with self.assertRaises(RuntimeError):
+                changes.compact(timedelta(0), batch_size=2)
+        remaining = CatalogChange.objects.filter(action=CatalogChange.DELETE)
+        self.assertEqual(list(remaining.values_list('seq', flat=True)), [tombstones[2].seq])
+        self.assertEqual(changes.compacted_through(), tombstones[1].seq)
+        response = self.client.get(self.url, {'since': tombstones[0].seq})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
@@ -0,0 +1,53 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .models import Author, Book
+
+
+@override_settings(BOOK_COUNT={'THRESHOLD': 5, 'STATS_TIMEOUT': 600})
+class ApproximateCountTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name="Terry Pratchett")
+        self.other = Author.objects.create(name="Neil Gaiman")
+        for i in range(8):
+            Book.objects.create(title=f"Discworld {i}", publication_year=1983 + i % 2, author=self.author)
+        Book.objects.create(title="Good Omens", publication_year=1990, author=self.other)
+        self.url = reverse('book-list')
+
+    def get(self, **params):
+        return self.client.get(self.url, {'count': 'true', 'page_size': 2, **params}).json()
+
+    def test_no_count_unless_asked(self):
+        self.assertNotIn('count', self.client.get(self.url).json())
+
+    def test_exact_below_threshold(self):
+        data = self.get(author=self.other.pk)
+        self.assertEqual((data['count'], data['count_approximate']), (1, False))
+        data = self.get(author=self.author.pk, publication_year=1983)
+        self.assertEqual((data['count'], data['count_approximate']), (4, False))
+
+    def test_capped_count_reads_at_most_threshold_rows(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.get(search='discworld')
+        self.assertEqual((data['count'], data['count_approximate']), (6, True))
+        self.assertTrue(any('COUNT(' in q['sql'] and 'LIMIT 6' in q['sql'] for q in ctx.captured_queries))
+
+    def test_estimate_from_cached_stats(self):
+        self.assertEqual((self.get()['count'], self.get()['count_approximate']), (9, True))
+        self.assertEqual(self.get(author=self.author.pk)['count'], 8)
+        # The statistics are cached: new books don't change the estimate until they expire
+        Book.objects.create(title="Mort", publication_year=1987, author=self.author)
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.get(author=self.author.pk)
+        self.assertEqual((data['count'], data['count_approximate']), (8, True))
+        self.assertFalse(any('GROUP BY' in q['sql'] for q in ctx.captured_queries))
+
+    def test_count_survives_paging(self):
+        first = self.get(author=self.other.pk, page_size=1)
+        self.assertEqual(first['count'], 1)
+        self.assertIn('count=true', self.get(page_size=2)['next'])
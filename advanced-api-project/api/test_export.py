@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from . import export
+from .models import Author, Book
+
+
+class BookExportTests(APITestCase):
+
+    def setUp(self):
+        self.lem = Author.objects.create(name="Stanisław Lem")
+        self.adams = Author.objects.create(name="Douglas Adams")
+        Book.objects.create(title="Solaris", publication_year=1961, author=self.lem)
+        Book.objects.create(title="The Cyberiad", publication_year=1965, author=self.lem)
+        Book.objects.create(title="Mostly Harmless", publication_year=1992, author=self.adams)
+
+    def export(self, export_format, **params):
+        response = self.client.get(reverse('book-export', kwargs={'export_format': export_format}), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_export(self):
+        rows = [json.loads(line) for line in self.export('ndjson').splitlines()]
+        self.assertEqual([row['title'] for row in rows], ["Mostly Harmless", "Solaris", "The Cyberiad"])
+        self.assertEqual(rows[1]['author_name'], "Stanisław Lem")
+        self.assertEqual(set(rows[0]), set(export.EXPORT_FIELDS))
+
+    def test_csv_export_honors_list_filters(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('csv', author=self.lem.pk, ordering='-publication_year'))))
+        self.assertEqual([row['title'] for row in rows], ["The Cyberiad", "Solaris"])
+
+    def test_chunked_output_reads_rows_in_chunks(self):
+        chunks = list(export.iter_ndjson(Book.objects.order_by('id'), chunk_size=2))
+        self.assertEqual([chunk.count('\n') for chunk in chunks], [2, 1])
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse('book-export', kwargs={'export_format': 'xml'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_management_command(self):
+        out = io.StringIO()
+        call_command('export_books', '--format', 'ndjson', '--filter', 'search=solaris', stdout=out)
+        self.assertEqual([json.loads(line)['title'] for line in out.getvalue().splitlines()], ["Solaris"])
@@ -0,0 +1,41 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from .fast_serializers import UnsupportedField, ValuesRepresentation
+from .models import Author, Book
+from .serializers import AuthorSerializer, BookSerializer
+
+
+class ValuesRepresentationTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name="Iain M. Banks")
+        for i, title in enumerate(["Excession", "Use of Weapons", "Look to Windward", "Matter"]):
+            Book.objects.create(title=title, publication_year=1987 + i, author=self.author)
+
+    def test_output_is_byte_identical_to_serializer(self):
+        queryset = Book.objects.order_by('title')
+        fast = ValuesRepresentation(BookSerializer())
+        self.assertEqual(
+            JSONRenderer().render(fast.to_representation(fast.values(queryset))),
+            JSONRenderer().render(BookSerializer(queryset, many=True).data),
+        )
+
+    def test_list_view_uses_values_rows(self):
+        response = self.client.get(reverse('book-list'), {'ordering': '-publication_year', 'page_size': 2})
+        expected = BookSerializer(Book.objects.order_by('-publication_year', 'id')[:2], many=True).data
+        self.assertEqual(response.data['results'], expected)
+        self.assertEqual(len(self.client.get(response.data['next']).data['results']), 2)
+
+    def test_unsupported_fields_fall_back(self):
+        with self.assertRaises(UnsupportedField):
+            ValuesRepresentation(AuthorSerializer())
+
+        class TitleUpperSerializer(BookSerializer):
+            title = serializers.SerializerMethodField()
+
+        with self.assertRaises(UnsupportedField):
+            ValuesRepresentation(TitleUpperSerializer())
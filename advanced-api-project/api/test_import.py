@@ -0,0 +1,80 @@
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.test import TestCase
+from . import changes
+from .importer import BookImporter
+from .models import Author, Book, CatalogChange, ImportCheckpoint
+
+
+class ImportBooksTests(TestCase):
+
+    def setUp(self):
+        self.author = Author.objects.create(name="Ursula K. Le Guin")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def run_command(self, *args, **options):
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_books', *args, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_import_resolves_and_creates_authors(self):
+        path = self.write('feed.csv', (
+            "title,publication_year,author_name\n"
+            "The Dispossessed,1974,Ursula K. Le Guin\n"
+            "Kindred,1979,Octavia E. Butler\n"
+            "Dawn,1987,Octavia E. Butler\n"
+            ",1990,Nobody\n"
+            "Future Book,9999,Octavia E. Butler\n"
+        ))
+        out, err = self.run_command(path, batch_size=2, commit_size=2)
+        self.assertIn("3 books imported, 2 records skipped", out)
+        self.assertIn("Skipped record 4", err)
+        self.assertEqual(Author.objects.count(), 2)
+        self.assertEqual(self.author.books.get().title, "The Dispossessed")
+        self.assertEqual(Book.objects.filter(author__name="Octavia E. Butler").count(), 2)
+
+    def test_jsonl_import_keeps_derived_data_in_sync(self):
+        since = changes.latest_seq()
+        path = self.write('feed.jsonl', "\n".join(json.dumps(row) for row in [
+            {'title': "The Lathe of Heaven", 'publication_year': 1971, 'author': "Ursula K. Le Guin"},
+            {'title': "Parable of the Sower", 'publication_year': 1993, 'author_name': "Octavia E. Butler"},
+        ]) + "\nnot json\n")
+        self.run_command(path)
+        self.assertEqual(Book.objects.count(), 2)
+        recorded = CatalogChange.objects.filter(seq__gt=since)
+        self.assertEqual(recorded.filter(kind=CatalogChange.BOOK).count(), 2)
+        self.assertEqual(recorded.filter(kind=CatalogChange.AUTHOR).count(), 1)
+        response = self.client.get('/books/', {'search': 'sower'})
+        self.assertEqual([row['title'] for row in response.json()['results']], ["Parable of the Sower"])
+
+    def test_resume_after_crash(self):
+        records = [{'title': f"Book {i}", 'publication_year': 2000, 'author': "Anon"} for i in range(5)]
+
+        def crashing():
+            yield from records[:4]
+            raise RuntimeError("killed")
+
+        with self.assertRaises(RuntimeError):
+            BookImporter('feed', batch_size=2, commit_size=2).run(crashing())
+        self.assertEqual(ImportCheckpoint.objects.get(source='feed').position, 4)
+        self.assertEqual(Book.objects.count(), 4)
+
+        checkpoint = BookImporter('feed', batch_size=2, commit_size=2).run(iter(records))
+        self.assertTrue(checkpoint.finished)
+        self.assertEqual(sorted(Book.objects.values_list('title', flat=True)), [r['title'] for r in records])
+
+        # A finished source is not imported twice, unless restarted
+        BookImporter('feed').run(iter(records))
+        self.assertEqual(Book.objects.count(), 5)
+        BookImporter('feed').run(iter(records), restart=True)
+        self.assertEqual(Book.objects.count(), 10)
@@ -0,0 +1,39 @@
+import json
+from unittest import mock, skipIf
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from . import negotiation, renderers
+from .models import Author, Book
+
+MSGPACK = 'application/msgpack'
+
+
+@skipIf(renderers.msgpack is None, "msgpack is not installed")
+class MessagePackNegotiationTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        author = Author.objects.create(name="Italo Calvino")
+        for i, title in enumerate(["Invisible Cities", "If on a winter's night a traveler"]):
+            Book.objects.create(title=title, publication_year=1972 + i * 7, author=author)
+        self.url = reverse('book-list')
+
+    def test_same_data_smaller_body(self):
+        as_json = self.client.get(self.url, HTTP_ACCEPT='application/json')
+        as_msgpack = self.client.get(self.url, HTTP_ACCEPT=MSGPACK)
+        self.assertEqual(as_msgpack['Content-Type'], MSGPACK)
+        self.assertIn('Accept', as_msgpack['Vary'])
+        self.assertEqual(renderers.msgpack.unpackb(as_msgpack.content), json.loads(as_json.content))
+        self.assertLess(len(as_msgpack.content), len(as_json.content))
+
+    def test_browsers_and_wildcards_keep_json(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='*/*')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        response = self.client.get(self.url, HTTP_ACCEPT='text/html,application/xhtml+xml,*/*;q=0.8')
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+
+    def test_not_offered_without_msgpack(self):
+        with mock.patch.object(negotiation, 'msgpack', None):
+            response = self.client.get(self.url, HTTP_ACCEPT=MSGPACK)
+        self.assertEqual(response.status_code, 406)
@@ -0,0 +1,75 @@
+import json
+from base64 import urlsafe_b64encode
+from urllib.parse import parse_qs, urlsplit
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Author, Book
+
+
+class BookKeysetPaginationTests(APITestCase):
+
+    def setUp(self):
+        self.author = Author.objects.create(name="John Doe")
+        # Duplicate titles and years so the id tiebreaker matters
+        for i in range(7):
+            Book.objects.create(title=f"Book {i % 3}", publication_year=2000 + i % 2, author=self.author)
+        self.list_url = reverse('book-list')
+
+    def walk(self, params):
+        # Follow `next` links until the end and collect the ids
+        ids, pages = [], []
+        response = self.client.get(self.list_url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+            ids.extend(row['id'] for row in response.data['results'])
+            if not response.data['next']:
+                return ids, pages
+            response = self.client.get(response.data['next'])
+
+    def test_pages_match_full_ordering(self):
+        for ordering in ['title', '-title', 'publication_year', '-publication_year']:
+            expected = list(Book.objects.order_by(ordering, 'id').values_list('id', flat=True))
+            ids, pages = self.walk({'ordering': ordering, 'page_size': 2})
+            self.assertEqual(ids, expected, ordering)
+            self.assertEqual(len(pages), 4)
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get(self.list_url, {'page_size': 3}).data
+        self.assertIsNone(first['previous'])
+        second = self.client.get(first['next']).data
+        back = self.client.get(second['previous']).data
+        self.assertEqual(back['results'], first['results'])
+
+    def test_deep_page_uses_seek_not_offset(self):
+        first = self.client.get(self.list_url, {'page_size': 2}).data
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(first['next'])
+        sql = ctx.captured_queries[-1]['sql'].upper()
+        self.assertNotIn('OFFSET', sql)
+        self.assertNotIn('COUNT(', sql)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.list_url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def cursor(self, data):
+        return urlsafe_b64encode(json.dumps(data).encode('utf-8')).decode('ascii')
+
+    def test_cursor_values_are_validated(self):
+        for url in [self.list_url, reverse('async-book-list')]:
+            for values in [[None, 1], ["x", 1], [{"a": 1}, 1], [[2000], 1], [2000]]:
+                cursor = self.cursor({'o': ['publication_year', 'id'], 'v': values, 'r': 0})
+                response = self.client.get(url, {'ordering': 'publication_year', 'cursor': cursor})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, (url, values))
+
+    def test_cursor_is_tied_to_its_ordering(self):
+        next_url = self.client.get(self.list_url, {'ordering': 'title', 'page_size': 2}).data['next']
+        cursor = parse_qs(urlsplit(next_url).query)['cursor'][0]
+        response = self.client.get(self.list_url, {'ordering': 'publication_year', 'cursor': cursor})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.list_url, {'ordering': 'title', 'cursor': cursor})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,83 @@
+import re
+from urllib.parse import parse_qs, urlsplit
+from itertools import product
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .models import Author, Book
+
+# A bare "SCAN api_book" is a full table scan; index scans read
+# "SCAN api_book USING [COVERING] INDEX ..."
+FULL_SCAN = re.compile(r'\bSCAN (api_book|api_author)\b(?! USING)')
+# Sorting the whole (remaining) table; "RIGHT PART OF ORDER BY" is fine
+FULL_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+
+FILTERS = [
+    {},
+    {'title': 'Book 3'},
+    {'author': None},
+    {'publication_year': 2001},
+    {'author': None, 'publication_year': 2001},
+]
+ORDERINGS = ['title', '-title', 'publication_year', '-publication_year']
+
+
+class BookQueryPlanTests(APITestCase):
+    """
+    Run EXPLAIN QUERY PLAN on the SQL that /books/ actually executes for
+    every supported filter/ordering combination (first page and a deeper
+    cursor page) and fail if any of them falls back to a full table scan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name="Planner")
+        Book.objects.bulk_create(
+            Book(title=f"Book {i % 10}", publication_year=2000 + i % 5, author=cls.author) for i in range(50)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return '\n'.join(row[-1] for row in cursor.fetchall())
+
+    def book_queries(self, params, url=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url or reverse('book-list'), params)
+        self.assertEqual(response.status_code, 200)
+        queries = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT') and 'api_book' in q['sql']]
+        return response, queries
+
+    def assert_no_full_scan(self, params, allow_sort=True, url=None):
+        response, queries = self.book_queries(params, url)
+        self.assertTrue(queries, params)
+        for sql in queries:
+            plan = self.explain(sql)
+            self.assertIsNone(FULL_SCAN.search(plan), f"{params}\n{sql}\n{plan}")
+            if not allow_sort:
+                self.assertNotIn(FULL_SORT, plan, f"{params}\n{sql}\n{plan}")
+        return response
+
+    def test_filter_and_ordering_combinations_use_indexes(self):
+        for filters, ordering in product(FILTERS, ORDERINGS):
+            params = {key: self.author.pk if key == 'author' else value for key, value in filters.items()}
+            params.update(ordering=ordering, page_size=3)
+            # Unfiltered listings must walk an index in order, not sort the table
+            allow_sort = bool(filters)
+            with self.subTest(**params):
+                response = self.assert_no_full_scan(params, allow_sort)
+                if response.data['next']:
+                    # Deeper pages add the keyset predicate
+                    cursor = parse_qs(urlsplit(response.data['next']).query)['cursor'][0]
+                    self.assert_no_full_scan({**params, 'cursor': cursor}, allow_sort)
+
+    def test_author_books_walk_the_author_index(self):
+        url = reverse('author-books', kwargs={'pk': self.author.pk})
+        response = self.assert_no_full_scan({'page_size': 3}, allow_sort=False, url=url)
+        cursor = parse_qs(urlsplit(response.data['next']).query)['cursor'][0]
+        self.assert_no_full_scan({'page_size': 3, 'cursor': cursor}, allow_sort=False, url=url)
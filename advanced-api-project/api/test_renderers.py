@@ -0,0 +1,51 @@
+import datetime
+import decimal
+import json
+from unittest import mock, skipIf
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.functional import lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from . import renderers
+from .models import Author, Book
+from .renderers import FastJSONRenderer
+
+
+@skipIf(renderers.orjson is None, "orjson is not installed")
+class FastJSONRendererTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_same_bytes_as_json_renderer(self):
+        data = {
+            'title': "Ficciones — Borges",
+            'year': 1944,
+            'when': datetime.datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+            'price': decimal.Decimal('9.50'),
+            'label': lazy(lambda: "lazy", str)(),
+            'ids': (1, 2),
+            3: None,
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_indent_uses_json_renderer(self):
+        body = FastJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+        self.assertEqual(body, b'{\n    "a": 1\n}')
+
+    def test_book_list_is_rendered_by_default(self):
+        author = Author.objects.create(name="Jorge Luis Borges")
+        Book.objects.create(title="Ficciones", publication_year=1944, author=author)
+        with mock.patch.object(renderers.orjson, 'dumps', wraps=renderers.orjson.dumps) as dumps:
+            response = self.client.get(reverse('book-list'))
+        self.assertTrue(dumps.called)
+        self.assertEqual(json.loads(response.content)['results'][0]['title'], "Ficciones")
+
+
+class FastJSONRendererFallbackTests(APITestCase):
+
+    def test_without_orjson(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render({'a': [1, 2]}), b'{"a":[1,2]}')
@@ -0,0 +1,67 @@
+import io
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from . import search
+from .models import Author, Book
+
+
+class FullTextSearchTests(APITestCase):
+
+    def setUp(self):
+        self.tolkien = Author.objects.create(name="J. R. R. Tolkien")
+        self.herbert = Author.objects.create(name="Frank Herbert")
+        self.hobbit = Book.objects.create(title="The Hobbit", publication_year=1937, author=self.tolkien)
+        self.rings = Book.objects.create(title="The Return of the King", publication_year=1955, author=self.tolkien)
+        self.dune = Book.objects.create(title="Dune", publication_year=1965, author=self.herbert)
+        self.list_url = reverse('book-list')
+
+    def search(self, term, **params):
+        response = self.client.get(self.list_url, {'search': term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['title'] for row in response.data['results']]
+
+    def test_search_title_and_author(self):
+        self.assertEqual(self.search('dune'), ['Dune'])
+        self.assertEqual(self.search('hobb'), ['The Hobbit'])  # prefix match
+        self.assertCountEqual(self.search('tolkien'), ['The Hobbit', 'The Return of the King'])
+        self.assertEqual(self.search('tolkien king'), ['The Return of the King'])
+
+    def test_results_ranked_by_relevance_unless_ordering_given(self):
+        Book.objects.create(title="King of Kings, the King", publication_year=1990, author=self.herbert)
+        self.assertEqual(self.search('king')[0], "King of Kings, the King")
+        self.assertEqual(self.search('king', ordering='title')[0], "King of Kings, the King")
+        self.assertEqual(self.search('king', ordering='-title')[0], "The Return of the King")
+
+    def test_index_follows_writes(self):
+        self.dune.title = "Dune Messiah"
+        self.dune.save()
+        self.assertEqual(self.search('messiah'), ['Dune Messiah'])
+
+        self.herbert.name = "F. P. Herbert"
+        self.herbert.save()
+        self.assertEqual(self.search('f. p.'), ['Dune Messiah'])
+
+        self.dune.delete()
+        self.assertEqual(self.search('messiah'), [])
+        self.tolkien.delete()
+        self.assertEqual(self.search('hobbit'), [])
+
+    def test_fts_syntax_is_escaped(self):
+        self.assertEqual(self.search('"dune OR *'), [])
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {search.FTS_TABLE}')
+        self.assertEqual(self.search('dune'), [])
+        call_command('rebuild_search_index', batch_size=2, stdout=io.StringIO())
+        self.assertEqual(self.search('dune'), ['Dune'])
+
+    def test_ranked_results_paginate(self):
+        first = self.client.get(self.list_url, {'search': 'the', 'page_size': 1}).data
+        second = self.client.get(first['next']).data
+        titles = [first['results'][0]['title'], second['results'][0]['title']]
+        self.assertCountEqual(titles, ['The Hobbit', 'The Return of the King'])
+        self.assertIsNone(second['next'])
@@ -0,0 +1,56 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .models import Author, Book
+
+
+class SparseFieldsetTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name="Ted Chiang")
+        self.book = Book.objects.create(title="Exhalation", publication_year=2019, author=self.author)
+        Book.objects.create(title="Stories of Your Life", publication_year=2002, author=self.author)
+
+    def get(self, name, params, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(name, kwargs=kwargs), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data, [query['sql'] for query in ctx.captured_queries]
+
+    def test_book_list_fields(self):
+        data, queries = self.get('book-list', {'fields': 'id,title'})
+        self.assertEqual([list(row) for row in data['results']], [['id', 'title'], ['id', 'title']])
+        self.assertNotIn('publication_year', queries[-1])
+
+    def test_book_list_exclude(self):
+        data, _ = self.get('book-list', {'exclude': 'author,publication_year'})
+        self.assertEqual(list(data['results'][0]), ['id', 'title'])
+
+    def test_book_detail_defers_unused_columns(self):
+        data, queries = self.get('book-detail', {'fields': 'title'}, pk=self.book.pk)
+        self.assertEqual(data, {'title': "Exhalation"})
+        self.assertNotIn('author_id', queries[-1])
+
+    def test_author_without_books_skips_prefetch(self):
+        data, queries = self.get('author-list', {'fields': 'name'})
+        self.assertEqual(data['results'], [{'name': "Ted Chiang"}])
+        self.assertEqual(len(queries), 1)
+
+    def test_nested_fields(self):
+        data, queries = self.get('author-list', {'fields': 'name,books.title'})
+        self.assertEqual(data['results'][0]['books'], [{'title': "Exhalation"}, {'title': "Stories of Your Life"}])
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('publication_year', queries[1])
+
+        data, _ = self.get('author-list', {'exclude': 'books.author,books.id'})
+        self.assertEqual(list(data['results'][0]['books'][0]), ['title', 'publication_year'])
+
+    def test_writes_ignore_fieldsets(self):
+        self.client.force_authenticate(User.objects.create_user(username="writer"))
+        response = self.client.post(reverse('book-create') + '?fields=title', {'title': "Arrival"}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('publication_year', response.data)
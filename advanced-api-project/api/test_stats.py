@@ -0,0 +1,49 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .models import Author, Book
+
+
+class BookStatsTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.asimov = Author.objects.create(name="Isaac Asimov")
+        self.clarke = Author.objects.create(name="Arthur C. Clarke")
+        Book.objects.create(title="Foundation", publication_year=1951, author=self.asimov)
+        Book.objects.create(title="I, Robot", publication_year=1950, author=self.asimov)
+        Book.objects.create(title="The End of Eternity", publication_year=1955, author=self.asimov)
+        Book.objects.create(title="Childhood's End", publication_year=1953, author=self.clarke)
+        Book.objects.create(title="The City and the Stars", publication_year=1956, author=self.clarke)
+        Book.objects.create(title="Prelude to Space", publication_year=1951, author=self.clarke)
+        self.url = reverse('book-stats')
+
+    def test_counts_per_year_and_author(self):
+        # One GROUP BY query per aggregate
+        with self.assertNumQueries(2):
+            data = self.client.get(self.url).data
+        self.assertEqual(
+            [(row['publication_year'], row['count']) for row in data['by_publication_year']],
+            [(1950, 1), (1951, 2), (1953, 1), (1955, 1), (1956, 1)],
+        )
+        self.assertEqual(data['by_author'], [
+            {'author': self.asimov.pk, 'author_name': "Isaac Asimov", 'count': 3, 'min_year': 1950, 'max_year': 1955},
+            {'author': self.clarke.pk, 'author_name': "Arthur C. Clarke", 'count': 3, 'min_year': 1951, 'max_year': 1956},
+        ])
+
+    def test_filters_and_search(self):
+        data = self.client.get(self.url, {'publication_year': 1951}).data
+        self.assertEqual([row['count'] for row in data['by_author']], [1, 1])
+        data = self.client.get(self.url, {'search': 'end'}).data
+        self.assertEqual(data['by_publication_year'], [
+            {'publication_year': 1953, 'count': 1}, {'publication_year': 1955, 'count': 1},
+        ])
+
+    def test_cached_until_next_book_write(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+        Book.objects.create(title="Rendezvous with Rama", publication_year=1973, author=self.clarke)
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['by_author'][1]['max_year'], 1973)
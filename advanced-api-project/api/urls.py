@@ -1,14 +1,28 @@
 # api/urls.py
 from django.urls import path
+from .async_views import AsyncBookListView, AsyncBookDetailView
 from .views import (
     BookListView, BookDetailView,
-    BookCreateView, BookUpdateView, BookDeleteView
+    BookCreateView, BookUpdateView, BookDeleteView, BookBulkView, BookExportView,
+    BookStatsView, BookBatchView,
+    AuthorListView, AuthorDetailView, AuthorSummaryListView, AuthorBookListView, ChangeFeedView
 )
 
 urlpatterns = [
     path('books/', BookListView.as_view(), name='book-list'),      # GET all books
-    path('books/detail/', BookDetailView.as_view(), name='book-detail'),  # GET one book (via query param ?id=)
+    path('books/<int:pk>/', BookDetailView.as_view(), name='book-detail'),  # GET one book
     path('books/create/', BookCreateView.as_view(), name='book-create'),  # POST new book
-    path('books/update/', BookUpdateView.as_view(), name='book-update'),  # PUT/PATCH update
-    path('books/delete/', BookDeleteView.as_view(), name='book-delete'),  # DELETE remove
+    path('books/update/<int:pk>/', BookUpdateView.as_view(), name='book-update'),  # PUT/PATCH update
+    path('books/delete/<int:pk>/', BookDeleteView.as_view(), name='book-delete'),  # DELETE remove
+    path('books/bulk/', BookBulkView.as_view(), name='book-bulk'),  # POST/PATCH many books at once
+    path('books/export/<str:export_format>/', BookExportView.as_view(), name='book-export'),  # stream NDJSON/CSV
+    path('books/batch/', BookBatchView.as_view(), name='book-batch'),  # GET/POST many books by id
+    path('books/stats/', BookStatsView.as_view(), name='book-stats'),  # GET counts per year / author
+    path('authors/', AuthorListView.as_view(), name='author-list'),  # GET authors with their books
+    path('authors/<int:pk>/', AuthorDetailView.as_view(), name='author-detail'),  # GET one author
+    path('authors/summary/', AuthorSummaryListView.as_view(), name='author-summary'),  # GET authors + book count
+    path('authors/<int:pk>/books/', AuthorBookListView.as_view(), name='author-books'),  # GET one author's books
+    path('async/books/', AsyncBookListView.as_view(), name='async-book-list'),  # GET all books (async ORM)
+    path('async/books/<int:pk>/', AsyncBookDetailView.as_view(), name='async-book-detail'),  # GET one book (async ORM)
+    path('changes/', ChangeFeedView.as_view(), name='change-feed'),  # GET ?since=<seq> delta sync
 ]
@@ -0,0 +1,9 @@
+# api/utils.py
+from itertools import islice
+
+
+def chunked(iterable, size):
+    """Yield lists of up to `size` items from `iterable`."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -1,25 +1,438 @@
 # api/views.py
-from rest_framework import generics, filters
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Prefetch, Window
+from django.db.models.functions import RowNumber
+from rest_framework import generics, filters, status
+from rest_framework.views import APIView
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import _positive_int
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly, IsAuthenticated
+from rest_framework.response import Response
 from django_filters import rest_framework
-from .models import Book
-from .serializers import BookSerializer
+from . import changes, export
+from .cache import CachedListMixin, CachedResponseMixin
+from .fast_serializers import FastListMixin
+from .models import Author, Book, CatalogChange
+from .negotiation import MessagePackMixin
+from .pagination import AuthorBookKeysetPagination, BookKeysetPagination, KeysetPagination
+from .search import FullTextSearchFilter
+from .serializers import AuthorSerializer, AuthorSummarySerializer, BookBulkSerializer, BookSerializer, only_fields
+from .signals import books_bulk_saved
 
 
-class BookListView(generics.ListAPIView):
+class ProjectionMixin:
+    """
+    Push ?fields= / ?exclude= down into the SQL: only the columns the
+    (trimmed) serializer reads are selected, plus the orderable ones.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        ordering_fields = getattr(self, 'ordering_fields', None)
+        always = ordering_fields if isinstance(ordering_fields, (list, tuple)) else ()
+        names = only_fields(self.get_serializer(), always=always)
+        return queryset.only(*names) if names else queryset
+
+
+class BookFilterMixin:
+    """
+    Filtering / searching / ordering shared by every view that lists books,
+    so ?author=&publication_year=&search=&ordering= behave the same everywhere.
+    """
     queryset = Book.objects.all()
-    serializer_class = BookSerializer
-    permission_classes = [IsAuthenticatedOrReadOnly]
 
-    # Enable filtering, searching, ordering
-    filter_backends = [rest_framework.DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # Enable filtering, ordering, searching (FTS5 search ranks by relevance
+    # when no ?ordering= is given, so it runs after OrderingFilter)
+    filter_backends = [rest_framework.DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
 
     # Filtering fields
     filterset_fields = ['title', 'author', 'publication_year']
 
-    # Searching fields
-    search_fields = ['title', 'author']
+    # Searching fields (used by the LIKE fallback on non-SQLite databases)
+    search_fields = ['title', 'author__name']
 
-    # Ordering fields
-    ordering_fields = ['title', 'publication_year', 'pages']
+    # Ordering fields (id is always appended by the paginator as a tiebreaker)
+    ordering_fields = ['title', 'publication_year']
     ordering = ['title']  # default ordering
+
+
+class BookListView(MessagePackMixin, CachedListMixin, FastListMixin, ProjectionMixin, BookFilterMixin,
+                   generics.ListAPIView):
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    # Responses are cached per filter/search/ordering/cursor combination
+    # until the next Book or Author write
+    cache_namespace = 'book-list'
+
+    # Keyset pagination: ?cursor= / ?page_size=, no OFFSET or COUNT(*)
+    pagination_class = BookKeysetPagination
+
+    # Pages are built from values() rows, not Book instances (same output)
+    fast_list = True
+
+
+class BookBatchView(ProjectionMixin, generics.GenericAPIView):
+    """
+    Fetch many books by id in one IN query:
+    GET /books/batch/?ids=3,1,2  or  POST /books/batch/ {"ids": [3, 1, 2]}
+    Results come back in the requested order, unknown ids are listed under
+    `missing`, and at most BOOK_BATCH_MAX_IDS ids are accepted per call.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    # POST is only used to carry long id lists; it never writes
+    permission_classes = [AllowAny]
+    ids_query_param = 'ids'
+
+    def get_ids(self, raw):
+        if isinstance(raw, str):
+            raw = [part for part in raw.split(',') if part.strip()]
+        if not isinstance(raw, list) or not raw:
+            raise ValidationError({'ids': 'Provide a non-empty list of book ids.'})
+        try:
+            ids = list(dict.fromkeys(int(value) for value in raw))  # de-duplicate, keep order
+        except (TypeError, ValueError):
+            raise ValidationError({'ids': 'Book ids must be integers.'})
+        max_ids = getattr(settings, 'BOOK_BATCH_MAX_IDS', 100)
+        if len(ids) > max_ids:
+            raise ValidationError({'ids': f'At most {max_ids} ids per request.'})
+        return ids
+
+    def get(self, request, *args, **kwargs):
+        return self.batch_response(self.get_ids(request.query_params.get(self.ids_query_param, '')))
+
+    def post(self, request, *args, **kwargs):
+        data = request.data if hasattr(request.data, 'get') else {}
+        return self.batch_response(self.get_ids(data.get('ids')))
+
+    def batch_response(self, ids):
+        queryset = self.get_queryset()
+        if 'author' in self.get_serializer().fields:
+            queryset = queryset.select_related('author')
+        books = queryset.in_bulk(ids)
+        return Response({
+            'results': self.get_serializer([books[pk] for pk in ids if pk in books], many=True).data,
+            'missing': [pk for pk in ids if pk not in books],
+        })
+
+
+class BookStatsView(CachedResponseMixin, BookFilterMixin, generics.GenericAPIView):
+    """
+    Aggregates over the (filtered) catalog, computed with GROUP BY in the
+    database: books per publication year, and books plus first/last
+    publication year per author. Accepts the same filters as /books/ and is
+    cached until the next catalog write.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    cache_namespace = 'book-stats'
+
+    def get(self, request, *args, **kwargs):
+        return self.cached_response(request, self.build_response)
+
+    def build_response(self):
+        # Drop the list ordering: it would only be added to the GROUP BY
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        by_year = (
+            queryset.values('publication_year')
+            .annotate(count=Count('id'))
+            .order_by('publication_year')
+        )
+        by_author = (
+            queryset.values('author', author_name=F('author__name'))
+            .annotate(count=Count('id'), min_year=Min('publication_year'), max_year=Max('publication_year'))
+            .order_by('author')
+        )
+        return Response({
+            'by_publication_year': list(by_year),
+            'by_author': list(by_author),
+        })
+
+
+class BookExportView(BookFilterMixin, generics.GenericAPIView):
+    """
+    Stream the (filtered) catalog as NDJSON or CSV:
+    GET /books/export/ndjson/?author=3  or  GET /books/export/csv/
+    Rows are read in chunks with a server-side iterator and written as they
+    come, so memory stays flat however large the table is.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def perform_content_negotiation(self, request, force=False):
+        # The export format comes from the URL; the renderer is only used
+        # for JSON error responses, so never answer 406
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, export_format, *args, **kwargs):
+        if export_format not in export.FORMATS:
+            raise NotFound(f'Unknown export format "{export_format}".')
+        queryset = self.filter_queryset(self.get_queryset())
+        return export.streaming_response(queryset, export_format)
+
+
+class BookDetailView(ProjectionMixin, generics.RetrieveAPIView):
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+
+class BookCreateView(generics.CreateAPIView):
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+
+
+class BookUpdateView(generics.UpdateAPIView):
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+
+
+class BookDeleteView(generics.DestroyAPIView):
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+
+
+class BookBulkView(generics.GenericAPIView):
+    """
+    POST a list of books to create them, or PATCH a list of partial books
+    (each with its `id`) to update them. All rows are validated in one pass
+    (authors are checked with a single IN query) and written with
+    bulk_create / bulk_update in ?batch_size= batches inside one
+    transaction. Nothing is written if any row is invalid; errors are
+    reported per row as {"index": ..., "errors": {...}}.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookBulkSerializer
+    permission_classes = [IsAuthenticated]
+    batch_size_query_param = 'batch_size'
+
+    def get_options(self):
+        return {'BATCH_SIZE': 500, 'MAX_ROWS': 1000, **getattr(settings, 'BOOK_BULK', {})}
+
+    def get_batch_size(self):
+        default = self.get_options()['BATCH_SIZE']
+        try:
+            return _positive_int(self.request.query_params[self.batch_size_query_param], strict=True, cutoff=default)
+        except (KeyError, ValueError):
+            return default
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['batch_size'] = self.get_batch_size()
+        return context
+
+    def get_serializer(self, *args, **kwargs):
+        return super().get_serializer(*args, many=True, max_length=self.get_options()['MAX_ROWS'], **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        # Validate in the transaction too, so the authors checked are still there when saving
+        with transaction.atomic():
+            if not serializer.is_valid():
+                return self.error_response(serializer.errors)
+            books = serializer.save()
+            books_bulk_saved.send(sender=Book, book_ids=[book.pk for book in books])
+        return Response(BookSerializer(books, many=True).data, status=status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        rows = request.data if isinstance(request.data, list) else []
+        row_errors = {}
+        ids = {}
+        for index, row in enumerate(rows):
+            try:
+                ids[index] = int(row['id'])
+            except (KeyError, TypeError, ValueError):
+                row_errors[index] = {'id': ['A valid book id is required.']}
+
+        with transaction.atomic():
+            books = Book.objects.select_for_update().in_bulk(set(ids.values()))
+            for index, book_id in ids.items():
+                if book_id not in books:
+                    row_errors[index] = {'id': [f'Book {book_id} does not exist.']}
+
+            serializer = self.get_serializer(books, data=request.data, partial=True)
+            valid = serializer.is_valid()
+            if not valid or row_errors:
+                return self.error_response(serializer.errors if not valid else {}, row_errors)
+            books = serializer.save()
+            books_bulk_saved.send(sender=Book, book_ids=[book.pk for book in books])
+        return Response(BookSerializer(books, many=True).data)
+
+    def error_response(self, errors, row_errors=None):
+        # ListSerializer reports row errors as a list (or a dict keyed by
+        # index in newer DRF); anything else is an error about the payload
+        if isinstance(errors, list):
+            errors = {index: detail for index, detail in enumerate(errors) if detail}
+        if errors and not all(isinstance(index, int) for index in errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        merged = dict(row_errors or {})
+        for index, detail in errors.items():
+            merged[index] = {**merged.get(index, {}), **detail}
+        return Response(
+            {'errors': [{'index': index, 'errors': merged[index]} for index in sorted(merged)]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class AuthorPrefetchMixin:
+    """
+    Load every author's books with a single prefetch query, however many
+    authors are on the page. ?books_limit=N caps the nested list per author
+    with a ROW_NUMBER() window inside that same query. With ?fields= both
+    queries select only the columns that are serialized, and the prefetch
+    is skipped entirely when `books` isn't requested.
+    """
+    books_limit_query_param = 'books_limit'
+    books_ordering = ['title', 'id']
+
+    def get_books_limit(self):
+        value = self.request.query_params.get(self.books_limit_query_param)
+        if value in (None, ''):
+            return None
+        try:
+            limit = int(value)
+            if limit < 0:
+                raise ValueError
+        except ValueError:
+            raise ValidationError({self.books_limit_query_param: 'Must be a non-negative integer.'})
+        return limit
+
+    def get_queryset(self):
+        serializer = self.get_serializer()
+        authors = Author.objects.all()
+        names = only_fields(serializer, always=['name'])
+        if names:
+            authors = authors.only(*names)
+        if 'books' not in serializer.fields:
+            return authors
+
+        books = Book.objects.order_by(*self.books_ordering)
+        names = only_fields(serializer.fields['books'].child, always=['author', *self.books_ordering])
+        if names:
+            books = books.only(*names)
+        limit = self.get_books_limit()
+        if limit is not None:
+            books = books.annotate(author_rank=Window(
+                RowNumber(), partition_by=F('author'), order_by=self.books_ordering,
+            )).filter(author_rank__lte=limit)
+        return authors.prefetch_related(Prefetch('books', queryset=books))
+
+
+class AuthorListView(CachedListMixin, AuthorPrefetchMixin, generics.ListAPIView):
+    serializer_class = AuthorSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    cache_namespace = 'author-list'
+    pagination_class = KeysetPagination
+
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['name']
+    ordering = ['name']
+
+
+class AuthorDetailView(AuthorPrefetchMixin, generics.RetrieveAPIView):
+    serializer_class = AuthorSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+
+class AuthorSummaryListView(CachedListMixin, generics.ListAPIView):
+    """
+    Authors with their book count and latest publication year instead of
+    every book: one GROUP BY query per page, and a response whose size
+    depends only on the number of authors. Books are under /authors/<id>/books/.
+    """
+    queryset = Author.objects.annotate(
+        book_count=Count('books'),
+        latest_publication_year=Max('books__publication_year'),
+    )
+    serializer_class = AuthorSummarySerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    cache_namespace = 'author-summary'
+    pagination_class = KeysetPagination
+
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['name', 'book_count']  # latest_publication_year can be NULL: not seekable
+    ordering = ['name']
+
+
+class AuthorBookListView(CachedListMixin, FastListMixin, ProjectionMixin, generics.ListAPIView):
+    """One author's books, keyset-paginated like /books/ (oldest first by default)."""
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    cache_namespace = 'author-books'
+    pagination_class = AuthorBookKeysetPagination
+    fast_list = True
+
+    # (author, publication_year) index: filtered and ordered by one range scan
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['title', 'publication_year']
+    ordering = ['publication_year']
+
+    def get_queryset(self):
+        # Not reached on cache hits, so the existence check is only paid once
+        if not Author.objects.filter(pk=self.kwargs['pk']).exists():
+            raise NotFound('No Author matches the given query.')
+        return super().get_queryset().filter(author_id=self.kwargs['pk'])
+
+
+class ChangeFeedView(APIView):
+    """
+    Delta sync: GET /changes/?since=<seq> returns what changed after `seq`:
+    the current rows of created/updated books and authors plus the ids of
+    deleted ones. Pass `next_since` back as ?since= until `has_more` is
+    false. Start with ?since=0 for a full sync. A client whose `since` is
+    older than the last compaction gets 410 Gone and must resync from 0.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    page_size = 500
+    max_page_size = 5000
+
+    def get(self, request, *args, **kwargs):
+        try:
+            since = int(request.query_params.get('since', 0))
+            if since < 0:
+                raise ValueError
+        except ValueError:
+            raise ValidationError({'since': 'Must be a non-negative integer.'})
+        try:
+            limit = _positive_int(request.query_params['limit'], strict=True, cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            limit = self.page_size
+
+        compacted_through = changes.compacted_through()
+        if 0 < since < compacted_through:
+            return Response(
+                {'detail': 'Deletions after this sequence number were compacted; resync from since=0.',
+                 'compacted_through': compacted_through},
+                status=status.HTTP_410_GONE,
+            )
+
+        entries = list(
+            CatalogChange.objects.filter(seq__gt=since).order_by('seq')
+            .values_list('seq', 'kind', 'object_id', 'action')[:limit + 1]
+        )
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        ids = {(kind, action): [] for kind, _ in CatalogChange.KIND_CHOICES for action, _ in CatalogChange.ACTION_CHOICES}
+        for seq, kind, object_id, action in entries:
+            ids[kind, action].append(object_id)
+
+        books = Book.objects.filter(id__in=ids[CatalogChange.BOOK, CatalogChange.UPSERT]).order_by('id')
+        authors = Author.objects.filter(id__in=ids[CatalogChange.AUTHOR, CatalogChange.UPSERT]).order_by('id')
+        return Response({
+            'since': since,
+            'next_since': entries[-1][0] if entries else since,
+            'has_more': has_more,
+            'books': {
+                'changed': BookSerializer(books, many=True).data,
+                'deleted': ids[CatalogChange.BOOK, CatalogChange.DELETE],
+            },
+            'authors': {
+                'changed': list(authors.values('id', 'name')),
+                'deleted': ids[CatalogChange.AUTHOR, CatalogChange.DELETE],
+            },
+        })
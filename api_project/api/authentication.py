@@ -0,0 +1,132 @@
+# api/authentication.py
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, TokenAuthentication
+from .models import ExpiringToken, hash_token
+
+
+class TokenCache:
+    """
+    token -> Token (with its user) for CachedTokenAuthentication.
+
+    Entries are keyed on a SHA-256 of the token, so raw tokens never end
+    up in the cache, and live for TOKEN_AUTH_CACHE['TIMEOUT'] seconds.
+    signals.py evicts them as soon as a token is deleted or its user is
+    saved (deactivated, password changed, ...).
+    """
+    prefix = 'auth:token:'
+    stats_keys = {'hits': 'auth:token:stats:hits', 'misses': 'auth:token:stats:misses'}
+
+    def __init__(self, alias=None, timeout=None):
+        options = getattr(settings, 'TOKEN_AUTH_CACHE', {})
+        self.alias = alias or options.get('ALIAS', 'default')
+        self.timeout = timeout if timeout is not None else options.get('TIMEOUT', 60)
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    digest = staticmethod(hash_token)
+
+    def make_key(self, key):
+        return self.prefix + self.digest(key)
+
+    def get(self, key):
+        token = self.cache.get(self.make_key(key))
+        self._count('hits' if token is not None else 'misses')
+        return token
+
+    def set(self, key, token):
+        self.cache.set(self.make_key(key), token, timeout=self.timeout)
+
+    def evict(self, keys):
+        self.evict_digests([self.digest(key) for key in keys])
+
+    def evict_digests(self, digests):
+        # For tokens stored hashed (ExpiringToken), whose raw key is unknown
+        self.cache.delete_many([self.prefix + digest for digest in digests])
+
+    # Stats: every hit is one Token + User query saved
+
+    def _count(self, name):
+        key = self.stats_keys[name]
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            if not self.cache.add(key, 1, timeout=None):
+                self.cache.incr(key)
+
+    def stats(self):
+        hits = self.cache.get(self.stats_keys['hits'], 0)
+        misses = self.cache.get(self.stats_keys['misses'], 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'queries_saved': hits,
+            'hit_rate': hits / total if total else 0.0,
+        }
+
+    def reset_stats(self):
+        self.cache.delete_many(list(self.stats_keys.values()))
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that resolves `Authorization: Token <key>` from
+    token_cache, so repeat requests skip the Token + User query.
+    """
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        if token is None:
+            token = self.lookup_token(key)
+            token_cache.set(key, token)
+        self.check_token(token)
+        return (token.user, token)
+
+    def lookup_token(self, key):
+        model = self.get_model()
+        try:
+            return model.objects.select_related('user').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+
+    def check_token(self, token):
+        # Also runs on cache hits
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+
+
+class ExpiringTokenAuthentication(CachedTokenAuthentication):
+    """
+    `Authorization: Token <key>` for ExpiringToken: looked up by digest
+    (cached like CachedTokenAuthentication) and rejected once expired.
+    """
+    model = ExpiringToken
+
+    def lookup_token(self, key):
+        try:
+            return self.model.objects.select_related('user').get(digest=hash_token(key))
+        except self.model.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+
+    def check_token(self, token):
+        super().check_token(token)
+        if token.is_expired:
+            raise exceptions.AuthenticationFailed('Token has expired.')
+
+
+class SubRequestAuthentication(BaseAuthentication):
+    """
+    Authenticates the items of a batch (api/batch.py) as the batch's user.
+    Only SubRequest carries `batch_auth`, so requests from the network
+    never match. Listed last, so 401s still advertise the Token scheme.
+    """
+
+    def authenticate(self, request):
+        return getattr(request, 'batch_auth', None)
@@ -0,0 +1,142 @@
+# api/batch.py
+import io
+import json
+import logging
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# Request metadata the sub-requests share with the batch request
+SHARED_META = ['SERVER_NAME', 'SERVER_PORT', 'HTTP_HOST', 'REMOTE_ADDR', 'HTTP_USER_AGENT']
+
+# Response headers worth returning to the client
+RESPONSE_HEADERS = ['Location', 'Idempotent-Replayed', 'Allow']
+
+logger = logging.getLogger(__name__)
+
+
+def max_batch_requests():
+    return getattr(settings, 'BATCH_MAX_REQUESTS', 30)
+
+
+class SubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'])
+    path = serializers.RegexField(r'^/', help_text="Absolute path, e.g. /api/books/?page_size=5")
+    body = serializers.JSONField(required=False, allow_null=True)
+    headers = serializers.DictField(child=serializers.CharField(), required=False)
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+    atomic = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        if len(value) > max_batch_requests():
+            raise serializers.ValidationError(f'At most {max_batch_requests()} requests per batch.')
+        return value
+
+
+class SubRequest(HttpRequest):
+    """A request for one batch item, run in-process as the batch's user."""
+
+    def __init__(self, parent, method, path, body=None, headers=None):
+        super().__init__()
+        url = urlsplit(path)
+        self.parent_scheme = parent.scheme
+        self.method = method
+        self.path = self.path_info = url.path
+        self.META = {key: parent.META[key] for key in SHARED_META if key in parent.META}
+        self.META.update(REQUEST_METHOD=method, PATH_INFO=url.path, QUERY_STRING=url.query,
+                         HTTP_ACCEPT='application/json')
+        for name, value in (headers or {}).items():
+            if name.lower() != 'authorization':
+                self.META['HTTP_' + name.upper().replace('-', '_')] = value
+        self.GET = QueryDict(url.query)
+        raw = b'' if body is None else json.dumps(body).encode('utf-8')
+        self.META.update(CONTENT_TYPE='application/json', CONTENT_LENGTH=str(len(raw)))
+        self._stream = io.BytesIO(raw)
+        self._read_started = False
+        # (user, auth) of the batch, picked up by SubRequestAuthentication
+        self.batch_auth = (parent.user, parent.auth)
+        # The batch request itself passed authentication; no session cookie is involved
+        self._dont_enforce_csrf_checks = True
+
+    def _get_scheme(self):
+        return self.parent_scheme
+
+
+class BatchView(APIView):
+    """
+    POST /api/batch/ with
+        {"requests": [{"method": "GET", "path": "/api/books/"},
+                      {"method": "POST", "path": "/api/books_all/", "body": {...}}],
+         "atomic": false}
+    runs each request in order through the URL resolver, in this process and
+    as the batch's user: one authentication, no middleware or connection
+    setup per item. Returns {"responses": [{"status", "headers", "body"}, ...]}
+    in the same order. An item that raises gets a 500 of its own; the others
+    still run.
+
+    With "atomic": true the items share one transaction; the first one
+    answering with a status >= 400 rolls everything back, and the items
+    after it are not run (status 424). Items of an atomic batch can't carry
+    an Idempotency-Key.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['requests']
+        if not serializer.validated_data['atomic']:
+            return Response({'responses': [self.run(request, item) for item in items]})
+
+        responses = []
+        with transaction.atomic():
+            for item in items:
+                result = self.run(request, item, atomic=True)
+                responses.append(result)
+                if result['status'] >= 400:
+                    transaction.set_rollback(True)
+                    break
+        failed = len(responses) < len(items) or responses[-1]['status'] >= 400
+        responses += [self.result(status.HTTP_424_FAILED_DEPENDENCY, {'detail': 'Not run: an earlier request failed.'})
+                      for _ in items[len(responses):]]
+        return Response({'responses': responses, 'rolled_back': failed})
+
+    def run(self, request, item, atomic=False):
+        if atomic and any(name.lower() == 'idempotency-key' for name in item.get('headers', {})):
+            # The stored response would outlive a rollback and be replayed
+            # for a write that never happened
+            return self.result(status.HTTP_400_BAD_REQUEST,
+                               {'detail': 'Idempotency-Key is not supported in atomic batches.'})
+        subrequest = SubRequest(request, item['method'], item['path'], item.get('body'), item.get('headers'))
+        try:
+            match = resolve(subrequest.path_info)
+        except Resolver404:
+            return self.result(status.HTTP_404_NOT_FOUND, {'detail': 'Not found.'})
+        view_class = getattr(match.func, 'cls', None)
+        if view_class is None:
+            return self.result(status.HTTP_400_BAD_REQUEST, {'detail': 'Only API endpoints can be batched.'})
+        if issubclass(view_class, BatchView):
+            return self.result(status.HTTP_400_BAD_REQUEST, {'detail': 'Batches cannot be nested.'})
+
+        subrequest.resolver_match = match
+        try:
+            response = match.func(subrequest, *match.args, **match.kwargs)
+        except Exception:
+            # Fail this item only: earlier items may already be committed
+            logger.exception('Batch item %s %s failed', item['method'], item['path'])
+            return self.result(status.HTTP_500_INTERNAL_SERVER_ERROR, {'detail': 'A server error occurred.'})
+        headers = {name: response[name] for name in RESPONSE_HEADERS if response.has_header(name)}
+        return self.result(response.status_code, getattr(response, 'data', None), headers)
+
+    @staticmethod
+    def result(status_code, body, headers=None):
+        return {'status': status_code, 'headers': headers or {}, 'body': body}
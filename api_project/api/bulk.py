@@ -0,0 +1,123 @@
+# api/bulk.py
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+def max_bulk_items():
+    return getattr(settings, 'BOOK_BULK_MAX_ITEMS', 1000)
+
+
+class BulkActionsMixin:
+    """
+    Router-registered bulk writes for a ModelViewSet, at <prefix>/bulk/:
+
+    PATCH  [{"id": 1, "title": "..."}, ...]   partial updates, one bulk_update()
+    DELETE {"ids": [1, 2]} or {"filter": {"author": "..."}}   one DELETE ... WHERE id IN
+
+    Each request is one transaction, and the response lists an outcome per
+    id. An update is all or nothing: if any row is unknown or invalid,
+    nothing is written and the response is 400. A delete removes the rows
+    that exist and reports the others as not_found.
+    """
+    bulk_filter_fields = []
+    bulk_batch_size = 500
+
+    def bulk_error(self, detail):
+        raise ValidationError({'detail': detail})
+
+    @action(detail=False, methods=['patch'], url_path='bulk')
+    def bulk_update(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            self.bulk_error('Expected a non-empty list of objects with an "id".')
+        if len(items) > max_bulk_items():
+            self.bulk_error(f'At most {max_bulk_items()} objects per request.')
+
+        ids = []
+        for item in items:
+            pk = item.get('id') if isinstance(item, dict) else None
+            if not isinstance(pk, int) or isinstance(pk, bool):
+                self.bulk_error('Every object needs an integer "id".')
+            ids.append(pk)
+        if len(set(ids)) != len(ids):
+            self.bulk_error('Duplicate ids.')
+
+        with transaction.atomic():
+            # One SELECT ... FOR UPDATE for every row (a no-op lock on SQLite)
+            instances = self.get_queryset().select_for_update().in_bulk(ids)
+            results, changed, fields, failed = [], [], set(), False
+            for item in items:
+                instance = instances.get(item['id'])
+                if instance is None:
+                    results.append({'id': item['id'], 'status': 'not_found'})
+                    failed = True
+                    continue
+                data = {name: value for name, value in item.items() if name != 'id'}
+                serializer = self.get_serializer(instance, data=data, partial=True)
+                if not serializer.is_valid():
+                    results.append({'id': item['id'], 'status': 'invalid', 'errors': serializer.errors})
+                    failed = True
+                    continue
+                for name, value in serializer.validated_data.items():
+                    setattr(instance, name, value)
+                fields.update(serializer.validated_data)
+                changed.append(instance)
+                results.append({'id': item['id'], 'status': 'updated'})
+
+            if failed:
+                # Report every row, but write none of them
+                for result in results:
+                    if result['status'] == 'updated':
+                        result['status'] = 'not_updated'
+                return Response({'results': results}, status=status.HTTP_400_BAD_REQUEST)
+            if fields:
+                self.get_queryset().model.objects.bulk_update(changed, sorted(fields), batch_size=self.bulk_batch_size)
+            self.bulk_updated(changed)
+        return Response({'results': results})
+
+    @bulk_update.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs):
+        data = request.data if isinstance(request.data, dict) else {}
+        queryset = self.get_queryset()
+        if 'ids' in data:
+            ids = data['ids']
+            # bool is an int subclass: reject true/false like bulk_update does
+            if not isinstance(ids, list) or not ids or any(type(pk) is not int for pk in ids):
+                self.bulk_error('"ids" must be a non-empty list of integers.')
+            if len(ids) > max_bulk_items():
+                self.bulk_error(f'At most {max_bulk_items()} ids per request.')
+            requested = list(dict.fromkeys(ids))
+            queryset = queryset.filter(pk__in=requested)
+        elif 'filter' in data:
+            filters = data['filter']
+            if not isinstance(filters, dict) or not filters or set(filters) - set(self.bulk_filter_fields):
+                self.bulk_error(f'"filter" must use some of: {", ".join(self.bulk_filter_fields)}.')
+            requested = None
+            queryset = queryset.filter(**filters)
+        else:
+            self.bulk_error('Send {"ids": [...]} or {"filter": {...}}.')
+
+        with transaction.atomic():
+            found = list(queryset.order_by('pk').values_list('pk', flat=True)[:max_bulk_items() + 1])
+            if len(found) > max_bulk_items():
+                self.bulk_error(f'Matches more than {max_bulk_items()} objects; narrow it down.')
+            # One DELETE ... WHERE id IN (Django still sends post_delete per row)
+            queryset.model.objects.filter(pk__in=found).delete()
+            self.bulk_deleted(found)
+
+        deleted = set(found)
+        results = [{'id': pk, 'status': 'deleted' if pk in deleted else 'not_found'}
+                   for pk in (requested if requested is not None else found)]
+        return Response({'results': results})
+
+    # Hooks, called inside the transaction
+
+    def bulk_updated(self, instances):
+        pass
+
+    def bulk_deleted(self, ids):
+        pass
@@ -0,0 +1,232 @@
+# api/events.py
+import asyncio
+import hashlib
+import json
+import secrets
+import threading
+from collections import deque
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+from .authentication import ExpiringTokenAuthentication
+from .models import ExpiringToken
+
+
+def event_settings():
+    options = getattr(settings, 'BOOK_EVENTS', {})
+    return {
+        'BUFFER_SIZE': options.get('BUFFER_SIZE', 1000),
+        'QUEUE_SIZE': options.get('QUEUE_SIZE', 100),
+        'HEARTBEAT': options.get('HEARTBEAT', 15),
+        'TICKET_TTL': options.get('TICKET_TTL', 30),
+        'TICKET_CACHE': options.get('TICKET_CACHE', 'default'),
+    }
+
+
+class Event:
+    __slots__ = ('id', 'seq', 'name', 'data')
+
+    def __init__(self, epoch, seq, name, data):
+        self.id = f'{epoch}-{seq}'
+        self.seq, self.name, self.data = seq, name, data
+
+    def encode(self):
+        return f'id: {self.id}\nevent: {self.name}\ndata: {json.dumps(self.data)}\n\n'
+
+
+# Queued to a subscriber that fell behind: its stream ends, and the client
+# reconnects with Last-Event-ID to catch up from the buffer
+OVERFLOW = object()
+
+
+class EventBroker:
+    """
+    In-process publish/subscribe for server-sent events.
+
+    publish() can be called from any thread (signal handlers run in sync
+    worker threads); each subscriber is an asyncio.Queue fed on its own
+    event loop with call_soon_threadsafe(). The last BUFFER_SIZE events are
+    kept in a ring buffer so a reconnecting client (Last-Event-ID) only
+    gets what it missed. Event ids are `<epoch>-<seq>`, the epoch being
+    new for every broker (i.e. every process start), so an id from another
+    process is never mistaken for one of ours. A client whose id can't be
+    served from the buffer gets a `reset` event and should refetch the list.
+    """
+
+    def __init__(self, buffer_size=None, queue_size=None):
+        options = event_settings()
+        self.buffer = deque(maxlen=buffer_size or options['BUFFER_SIZE'])
+        self.queue_size = queue_size or options['QUEUE_SIZE']
+        self.subscribers = {}  # queue -> its event loop
+        self.epoch = secrets.token_hex(4)
+        self.last_seq = 0
+        self.lock = threading.Lock()
+
+    def publish(self, name, data):
+        with self.lock:
+            self.last_seq += 1
+            event = Event(self.epoch, self.last_seq, name, data)
+            self.buffer.append(event)
+            subscribers = list(self.subscribers.items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self.deliver, queue, event)
+            except RuntimeError:
+                # Loop already closed; its stream is gone
+                self.unsubscribe(queue)
+        return event
+
+    def deliver(self, queue, event):
+        # Runs on the subscriber's loop
+        if queue.full():
+            # Drop everything unread, not just the oldest event: the client's
+            # Last-Event-ID must stay older than every event it never got
+            self.unsubscribe(queue)
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(OVERFLOW)
+        elif queue in self.subscribers:
+            queue.put_nowait(event)
+
+    def subscribe(self, last_event_id=None):
+        """
+        Register a queue on the running loop. Returns (queue, backlog), the
+        backlog being the buffered events after `last_event_id` (or a
+        `reset` event if they are no longer all buffered).
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self.lock:
+            self.subscribers[queue] = asyncio.get_running_loop()
+            backlog = self.backlog(last_event_id)
+        return queue, backlog
+
+    def backlog(self, last_event_id):
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.rpartition('-')
+        seq = int(seq) if seq.isdigit() else -1
+        oldest = self.buffer[0].seq if self.buffer else self.last_seq + 1
+        if epoch != self.epoch or not oldest - 1 <= seq <= self.last_seq:
+            # Another process's id, or too old for the buffer
+            return [Event(self.epoch, self.last_seq, 'reset', {})]
+        return [event for event in self.buffer if event.seq > seq]
+
+    def unsubscribe(self, queue):
+        with self.lock:
+            self.subscribers.pop(queue, None)
+
+
+broker = EventBroker()
+
+
+def publish_on_commit(name, data):
+    # Rolled-back writes (e.g. an atomic batch) must not be announced
+    transaction.on_commit(lambda: broker.publish(name, data))
+
+
+async def stream(queue, backlog, heartbeat, token):
+    """
+    SSE body: the backlog, then live events, with a comment line as
+    heartbeat. Ends with an `expired` event once `token` expires or is
+    deleted (rotated, logged out); the latter is checked every heartbeat.
+    """
+    try:
+        yield 'retry: 3000\n\n'
+        for event in backlog:
+            yield event.encode()
+        while True:
+            remaining = (token.expires - timezone.now()).total_seconds()
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=max(0, min(heartbeat, remaining)))
+            except asyncio.TimeoutError:
+                if remaining <= heartbeat or not await ExpiringToken.objects.filter(pk=token.pk).aexists():
+                    yield 'event: expired\ndata: {}\n\n'
+                    return
+                # Keeps proxies from closing an idle connection
+                yield ': heartbeat\n\n'
+                continue
+            if event is OVERFLOW:
+                return
+            yield event.encode()
+    finally:
+        broker.unsubscribe(queue)
+
+
+# Single-use stream tickets. EventSource can't send an Authorization header,
+# and a token in the URL would end up in access logs; a ticket there is
+# harmless, since it works once and only for TICKET_TTL seconds.
+
+def ticket_cache_key(ticket):
+    return 'events:ticket:' + hashlib.sha256(ticket.encode('utf-8')).hexdigest()
+
+
+def ticket_cache():
+    # Shared, so a ticket issued by any worker can be redeemed by the ASGI one
+    return caches[event_settings()['TICKET_CACHE']]
+
+
+def issue_ticket(token):
+    ticket = secrets.token_urlsafe(20)
+    ticket_cache().set(ticket_cache_key(ticket), token.pk, timeout=event_settings()['TICKET_TTL'])
+    return ticket
+
+
+def redeem_ticket(ticket):
+    """The ExpiringToken a ticket was issued for, or None. Works once."""
+    cache, cache_key = ticket_cache(), ticket_cache_key(ticket)
+    token_pk = cache.get(cache_key)
+    # Of two concurrent redeemers, only one gets to delete the entry
+    if token_pk is None or not cache.delete(cache_key):
+        return None
+    return ExpiringToken.objects.select_related('user').filter(pk=token_pk).first()
+
+
+def authenticate(request):
+    """The request's ExpiringToken (Authorization header or ?ticket=), or raises AuthenticationFailed."""
+    authentication = ExpiringTokenAuthentication()
+    keyword, _, key = request.headers.get('Authorization', '').partition(' ')
+    if keyword == authentication.keyword and key.strip():
+        return authentication.authenticate_credentials(key.strip())[1]
+    ticket = request.GET.get('ticket')
+    if not ticket:
+        raise AuthenticationFailed('Authentication credentials were not provided.')
+    token = redeem_ticket(ticket)
+    if token is None:
+        raise AuthenticationFailed('Invalid or used ticket.')
+    authentication.check_token(token)
+    return token
+
+
+@require_GET
+async def book_events(request):
+    """
+    GET /api/books/events/ -> text/event-stream of `created`, `updated` and
+    `deleted` Book events (data: the book, or {"id"} for deletes). Send
+    Last-Event-ID (EventSource does on reconnect) to resume.
+
+    Authenticate with `Authorization: Token <key>`, or from a browser with
+    ?ticket=<ticket> from POST /api/books/events/ticket/. Only served by
+    the ASGI app (see api_project/asgi.py).
+    """
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI the endless body would be buffered, holding a worker forever
+        return JsonResponse({'detail': 'Event streams need the ASGI server.'}, status=501)
+    try:
+        token = await sync_to_async(authenticate)(request)
+    except AuthenticationFailed as exc:
+        return JsonResponse({'detail': exc.detail}, status=exc.status_code)
+
+    queue, backlog = broker.subscribe(request.headers.get('Last-Event-ID'))
+    response = StreamingHttpResponse(
+        stream(queue, backlog, event_settings()['HEARTBEAT'], token),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: don't buffer the stream
+    return response
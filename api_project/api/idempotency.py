@@ -0,0 +1,138 @@
+# api/idempotency.py
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+
+
+class IdempotencyStore:
+    """
+    First responses of requests sent with an Idempotency-Key, kept in
+    Django's cache (IDEMPOTENCY['ALIAS'], which must be shared by all
+    workers, e.g. a database cache) for IDEMPOTENCY['TTL'] seconds.
+
+    An entry is claimed with cache.add() before the view runs, so of two
+    concurrent requests with the same key only one executes. The claim
+    expires after IDEMPOTENCY['LOCK_TIMEOUT'] seconds in case the worker
+    dies mid-request.
+    """
+    prefix = 'idempotency:'
+
+    def __init__(self, alias=None, ttl=None, lock_timeout=None):
+        options = getattr(settings, 'IDEMPOTENCY', {})
+        self.alias = alias or options.get('ALIAS', 'default')
+        self.ttl = ttl if ttl is not None else options.get('TTL', 24 * 60 * 60)
+        self.lock_timeout = lock_timeout if lock_timeout is not None else options.get('LOCK_TIMEOUT', 60)
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, user, method, path, key):
+        # Keys are per user and per endpoint: two users can't collide, and
+        # one key can't replay a response of another endpoint
+        raw = json.dumps([getattr(user, 'pk', None), method, path, key])
+        return self.prefix + hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def claim(self, cache_key, fingerprint):
+        """Returns None if claimed, else the existing entry."""
+        if self.cache.add(cache_key, {'state': IN_FLIGHT, 'fingerprint': fingerprint}, timeout=self.lock_timeout):
+            return None
+        # Raced with an expiry: treat as in flight, the client retries
+        return self.cache.get(cache_key) or {'state': IN_FLIGHT, 'fingerprint': fingerprint}
+
+    def save(self, cache_key, fingerprint, response):
+        entry = {
+            'state': DONE,
+            'fingerprint': fingerprint,
+            'status': response.status_code,
+            'data': response.data,
+            'headers': {name: response[name] for name in ('Location',) if response.has_header(name)},
+        }
+        self.cache.set(cache_key, entry, timeout=self.ttl)
+
+    def release(self, cache_key):
+        self.cache.delete(cache_key)
+
+
+idempotency_store = IdempotencyStore()
+
+
+def request_fingerprint(request):
+    # Hash of the parsed body (the raw stream is gone once DRF parsed it)
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    raw = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class IdempotencyMixin:
+    """
+    `Idempotency-Key: <unique string>` support for create / update /
+    partial_update (which goes through update) / destroy; views can wrap
+    other writes with idempotent() (BookViewSet does for its bulk actions).
+    The first response to a key is stored and replayed for retries (with
+    `Idempotent-Replayed: true`) without running the view again. Reusing a
+    key with a different body is 422; retrying while the first request
+    still runs is 409. Client errors (4xx) are stored whether the view
+    returns or raises them; server errors (5xx) are not, so those can be
+    retried.
+    """
+    idempotency_header = 'Idempotency-Key'
+    idempotency_key_max_length = 255
+
+    def idempotent(self, handler, request, *args, **kwargs):
+        key = request.headers.get(self.idempotency_header)
+        if not key:
+            return handler(request, *args, **kwargs)
+        if len(key) > self.idempotency_key_max_length:
+            return Response({'detail': f'{self.idempotency_header} is too long.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        cache_key = idempotency_store.make_key(request.user, request.method, request.path, key)
+        fingerprint = request_fingerprint(request)
+        entry = idempotency_store.claim(cache_key, fingerprint)
+        if entry is not None:
+            return self.replay(entry, fingerprint)
+
+        try:
+            response = handler(request, *args, **kwargs)
+        except Exception as exc:
+            try:
+                # Raised client errors (validation, 404, ...) are answers like
+                # any returned 4xx Response, and are stored the same way
+                response = self.handle_exception(exc)
+            except Exception:
+                idempotency_store.release(cache_key)
+                raise
+        if response.status_code >= 500:
+            idempotency_store.release(cache_key)
+        else:
+            idempotency_store.save(cache_key, fingerprint, response)
+        return response
+
+    def replay(self, entry, fingerprint):
+        if entry['fingerprint'] != fingerprint:
+            return Response({'detail': f'{self.idempotency_header} was already used with a different request body.'},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        if entry['state'] == IN_FLIGHT:
+            return Response({'detail': f'A request with this {self.idempotency_header} is still in progress.'},
+                            status=status.HTTP_409_CONFLICT)
+        response = Response(entry['data'], status=entry['status'], headers=entry['headers'])
+        response['Idempotent-Replayed'] = 'true'
+        return response
+
+    def create(self, request, *args, **kwargs):
+        return self.idempotent(super().create, request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        return self.idempotent(super().update, request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        return self.idempotent(super().destroy, request, *args, **kwargs)
@@ -0,0 +1,29 @@
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from api.models import ExpiringToken
+
+
+class Command(BaseCommand):
+    help = ("Delete expired API tokens in small batches, each its own short "
+            "transaction, so the table is never locked for long")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.0,
+                            help="Seconds to pause between batches to let other writers in")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = ExpiringToken.objects.filter(expires__lte=now)
+        purged = 0
+        while True:
+            # Walks the expires index; ids first so each DELETE is a pk IN (...)
+            ids = list(expired.order_by('expires').values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            ExpiringToken.objects.filter(pk__in=ids).delete()
+            purged += len(ids)
+            if options['sleep']:
+                time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} expired tokens."))
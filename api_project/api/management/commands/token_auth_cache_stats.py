@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from api.authentication import token_cache
+
+
+class Command(BaseCommand):
+    help = "Show how many token authentication queries the token cache saved"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Reset the counters after printing them")
+
+    def handle(self, *args, **options):
+        stats = token_cache.stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} queries_saved={stats['queries_saved']} "
+            f"hit_rate={stats['hit_rate']:.1%}"
+        )
+        if options['reset']:
+            token_cache.reset_stats()
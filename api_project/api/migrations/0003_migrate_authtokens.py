@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:01
+
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+
+def migrate_tokens(apps, schema_editor):
+    # Existing DRF tokens keep working, as hashed ExpiringTokens with a fresh
+    # lifetime; the plaintext rows are removed
+    Token = apps.get_model('authtoken', 'Token')
+    ExpiringToken = apps.get_model('api', 'ExpiringToken')
+    lifetime = timedelta(seconds=getattr(settings, 'EXPIRING_TOKEN', {}).get('LIFETIME', 24 * 60 * 60))
+    expires = timezone.now() + lifetime
+    tokens = Token.objects.all()
+    ExpiringToken.objects.bulk_create(
+        (ExpiringToken(digest=hashlib.sha256(token.key.encode('utf-8')).hexdigest(),
+                       user_id=token.user_id, expires=expires)
+         for token in tokens.iterator()),
+        batch_size=500,
+    )
+    tokens.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_expiring_token'),
+        ('authtoken', '0004_alter_tokenproxy_options'),
+    ]
+
+    operations = [
+        # Irreversible in effect: the raw tokens can't be recovered from digests
+        migrations.RunPython(migrate_tokens, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,56 @@
 from django.db import models
 
 # Create your models here.
+import hashlib
+import secrets
+from datetime import timedelta
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 class Book(models.Model):
     title = models.CharField(max_length=200)
     author = models.CharField(max_length=100)
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+
+def hash_token(key):
+    # Fixed-length digest stored instead of the raw token
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def default_token_lifetime():
+    return timedelta(seconds=getattr(settings, 'EXPIRING_TOKEN', {}).get('LIFETIME', 24 * 60 * 60))
+
+
+class ExpiringToken(models.Model):
+    """
+    API token that expires. Only a SHA-256 digest of the token is stored,
+    under a unique index, so a lookup is one index probe and a leaked
+    table doesn't leak usable tokens. The raw token is shown once, by
+    issue(). A user can hold several (one per login / client).
+    """
+    digest = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='expiring_tokens')
+    created = models.DateTimeField(auto_now_add=True)
+    expires = models.DateTimeField(db_index=True)  # purge_expired_tokens scans by expiry
+
+    @classmethod
+    def issue(cls, user, lifetime=None):
+        """Create a token for `user`; returns (token, raw key)."""
+        key = secrets.token_hex(20)
+        token = cls.objects.create(
+            digest=hash_token(key),
+            user=user,
+            expires=timezone.now() + (lifetime or default_token_lifetime()),
+        )
+        return token, key
+
+    @property
+    def is_expired(self):
+        return self.expires <= timezone.now()
+
+    def __str__(self):
+        return f"{self.user} token (expires {self.expires:%Y-%m-%d %H:%M})"
@@ -0,0 +1,30 @@
+# api/negotiation.py
+from django.utils.cache import patch_vary_headers
+from .parsers import MessagePackParser
+from .renderers import MessagePackRenderer, msgpack
+
+
+class MessagePackMixin:
+    """
+    Offer MessagePack next to the view's renderers and parsers when msgpack
+    is installed. It comes last, so clients that accept anything (`*/*`,
+    browsers) keep getting the view's first renderer.
+    """
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if msgpack is not None:
+            renderers.append(MessagePackRenderer())
+        return renderers
+
+    def get_parsers(self):
+        parsers = super().get_parsers()
+        if msgpack is not None:
+            parsers.append(MessagePackParser())
+        return parsers
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        # The body depends on Accept, so shared caches must key on it
+        patch_vary_headers(response, ['Accept'])
+        return response
@@ -0,0 +1,58 @@
+# api/pagination.py
+from rest_framework.pagination import BasePagination, CursorPagination, LimitOffsetPagination
+from rest_framework.settings import api_settings
+
+# Hard cap on rows per response, whatever the client asks for
+MAX_PAGE_SIZE = 100
+
+
+class BookCursorPagination(CursorPagination):
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    ordering = 'id'
+
+
+class BookLimitOffsetPagination(LimitOffsetPagination):
+    default_limit = api_settings.PAGE_SIZE or 20
+    max_limit = MAX_PAGE_SIZE
+
+
+class BookPagination(BasePagination):
+    """
+    Cursor pagination for clients (?cursor=, ?page_size=): stable under
+    inserts and no COUNT(*). Admin tooling that needs to jump around gets
+    limit/offset plus a count by passing ?limit= and/or ?offset=. Either
+    way a page holds at most MAX_PAGE_SIZE rows.
+    """
+    cursor_class = BookCursorPagination
+    limit_offset_class = BookLimitOffsetPagination
+
+    def __init__(self):
+        self.paginator = self.cursor_class()
+
+    def uses_limit_offset(self, request):
+        limit_offset = self.limit_offset_class
+        return limit_offset.limit_query_param in request.query_params \
+            or limit_offset.offset_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.uses_limit_offset(request):
+            self.paginator = self.limit_offset_class()
+            if not queryset.ordered:
+                # OFFSET over an unordered query can skip or repeat rows
+                queryset = queryset.order_by('pk')
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
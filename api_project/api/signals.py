@@ -0,0 +1,41 @@
+# api/signals.py
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .authentication import token_cache
+from .events import publish_on_commit
+from .models import Book, ExpiringToken
+from .serializers import BookSerializer
+
+
+# Evict cached token lookups as soon as they may be stale
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def evict_token(sender, instance, **kwargs):
+    token_cache.evict([instance.key])
+
+
+@receiver(post_save, sender=ExpiringToken)
+@receiver(post_delete, sender=ExpiringToken)
+def evict_expiring_token(sender, instance, **kwargs):
+    token_cache.evict_digests([instance.digest])
+
+
+@receiver(post_save, sender=get_user_model())
+def evict_user_tokens(sender, instance, created, **kwargs):
+    # Deactivation (or any other change) must not wait for the TTL
+    if not created:
+        token_cache.evict(Token.objects.filter(user=instance).values_list('key', flat=True))
+        token_cache.evict_digests(instance.expiring_tokens.values_list('digest', flat=True))
+
+
+# Book events for /api/books/events/ (bulk actions publish from BookViewSet)
+@receiver(post_save, sender=Book)
+def publish_saved_book(sender, instance, created, **kwargs):
+    publish_on_commit('created' if created else 'updated', dict(BookSerializer(instance).data))
+
+
+@receiver(post_delete, sender=Book)
+def publish_deleted_book(sender, instance, **kwargs):
+    publish_on_commit('deleted', {'id': instance.pk})
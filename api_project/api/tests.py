@@ -1,3 +1,608 @@
-from django.test import TestCase
+import asyncio
+import io
+import threading
+from datetime import timedelta
+from unittest import mock, skipIf
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase
+from . import events, negotiation, renderers
+from .authentication import CachedTokenAuthentication, SubRequestAuthentication, token_cache
+from .events import OVERFLOW, EventBroker
+from .idempotency import idempotency_store, request_fingerprint
+from .models import Book, ExpiringToken, hash_token
+from .renderers import FastJSONRenderer
+from .views import BookList
 
-# Create your tests here.
+
+class FastJSONRendererTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="reader"))
+        Book.objects.create(title="Beloved", author="Toni Morrison")
+
+    def test_book_endpoints_render_same_json(self):
+        for url in ['/api/books/', '/api/books_all/']:
+            response = self.client.get(url)
+            self.assertEqual(response.content, JSONRenderer().render(response.data))
+            self.assertEqual(response.json()['results'][0]['title'], "Beloved")
+
+    def test_without_orjson(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render({'a': [1, 2]}), b'{"a":[1,2]}')
+
+
+@skipIf(renderers.msgpack is None, "msgpack is not installed")
+class MessagePackNegotiationTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="service"))
+        self.book = Book.objects.create(title="Beloved", author="Toni Morrison")
+
+    def test_list_endpoints(self):
+        for url in ['/api/books/', '/api/books_all/']:
+            response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+            self.assertEqual(response['Content-Type'], 'application/msgpack')
+            self.assertEqual(renderers.msgpack.unpackb(response.content), self.client.get(url).json())
+
+    def test_create_from_msgpack(self):
+        body = renderers.msgpack.packb({'title': "Jazz", 'author': "Toni Morrison"})
+        response = self.client.post('/api/books_all/', body, content_type='application/msgpack',
+                                    HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(renderers.msgpack.unpackb(response.content)['title'], "Jazz")
+
+    def test_invalid_body(self):
+        response = self.client.post('/api/books_all/', b'\xc1', content_type='application/msgpack')
+        self.assertEqual(response.status_code, 400)
+
+    def test_browsers_keep_json(self):
+        self.assertEqual(self.client.get('/api/books/', HTTP_ACCEPT='*/*')['Content-Type'], 'application/json')
+        with mock.patch.object(negotiation, 'msgpack', None):
+            response = self.client.get('/api/books/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, 406)
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    # DRF's own Token model; the project default is ExpiringTokenAuthentication
+    view = staticmethod(BookList.as_view(authentication_classes=[CachedTokenAuthentication]))
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="reader", password="pw")
+        self.token = Token.objects.create(user=self.user)
+
+    def get(self, key=None):
+        request = APIRequestFactory().get('/api/books/', HTTP_AUTHORIZATION=f"Token {key or self.token.key}")
+        return self.view(request)
+
+    def test_repeat_requests_skip_token_query(self):
+        with self.assertNumQueries(2):  # Token + User join, then the books
+            self.assertEqual(self.get().status_code, 200)
+        with self.assertNumQueries(1):  # Just the books
+            self.assertEqual(self.get().status_code, 200)
+        stats = token_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['queries_saved']), (1, 1, 1))
+
+    def test_raw_token_not_in_cache_keys(self):
+        self.get()
+        self.assertIsNone(cache.get(self.token.key))
+        self.assertIsNotNone(cache.get(token_cache.make_key(self.token.key)))
+
+    def test_deleted_token_rejected_immediately(self):
+        self.get()
+        self.token.delete()
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_deactivated_user_rejected_immediately(self):
+        self.get()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_invalid_token(self):
+        self.assertEqual(self.get("nope").status_code, 401)
+
+
+class ExpiringTokenTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="reader", password="pw")
+
+    def login(self):
+        response = self.client.post('/api/auth/token/', {'username': "reader", 'password': "pw"})
+        self.assertEqual(response.status_code, 200)
+        return response.data['token']
+
+    def get_books(self, key):
+        return self.client.get('/api/books/', HTTP_AUTHORIZATION=f"Token {key}")
+
+    def test_only_digest_is_stored(self):
+        key = self.login()
+        token = ExpiringToken.objects.get(user=self.user)
+        self.assertEqual(token.digest, hash_token(key))
+        self.assertNotIn(key, token.digest)
+        self.assertEqual(self.get_books(key).status_code, 200)
+
+    def test_lookup_is_one_query_then_cached(self):
+        key = self.login()
+        with self.assertNumQueries(2):  # Token (by digest) + User join, then the books
+            self.get_books(key)
+        with self.assertNumQueries(1):
+            self.get_books(key)
+
+    def test_expired_token_rejected(self):
+        key = self.login()
+        self.get_books(key)  # Cached while still valid
+        ExpiringToken.objects.update(expires=timezone.now() - timedelta(seconds=1))
+        cache.clear()
+        self.assertEqual(self.get_books(key).status_code, 401)
+        token, key = ExpiringToken.issue(self.user, lifetime=timedelta(seconds=60))
+        self.get_books(key)
+        with mock.patch('api.models.timezone.now', return_value=token.expires):
+            self.assertEqual(self.get_books(key).status_code, 401)
+
+    def test_rotation(self):
+        old = self.login()
+        response = self.client.post('/api/auth/token/rotate/', HTTP_AUTHORIZATION=f"Token {old}")
+        self.assertEqual(response.status_code, 201)
+        new = response.data['token']
+        self.assertEqual(self.get_books(old).status_code, 401)
+        self.assertEqual(self.get_books(new).status_code, 200)
+        self.assertEqual(ExpiringToken.objects.filter(user=self.user).count(), 1)
+
+    def test_purge_expired_tokens(self):
+        for i in range(5):
+            ExpiringToken.issue(self.user, lifetime=timedelta(seconds=-1 if i < 3 else 60))
+        out = io.StringIO()
+        call_command('purge_expired_tokens', batch_size=2, stdout=out)
+        self.assertIn("Purged 3", out.getvalue())
+        self.assertEqual(ExpiringToken.objects.count(), 2)
+
+
+class PaginationTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="admin"))
+        Book.objects.bulk_create(Book(title=f"Book {i}", author="Anon") for i in range(250))
+
+    def test_cursor_by_default(self):
+        for url in ['/api/books/', '/api/books_all/']:
+            data = self.client.get(url).json()
+            self.assertEqual(len(data['results']), 20)
+            self.assertNotIn('count', data)
+            self.assertIn('cursor=', data['next'])
+
+    def test_cursor_walk(self):
+        ids, url = [], '/api/books/?page_size=100'
+        while url:
+            data = self.client.get(url).json()
+            ids.extend(row['id'] for row in data['results'])
+            url = data['next']
+        self.assertEqual(ids, sorted(Book.objects.values_list('id', flat=True)))
+
+    def test_limit_offset(self):
+        data = self.client.get('/api/books_all/', {'limit': 10, 'offset': 240}).json()
+        self.assertEqual(data['count'], 250)
+        self.assertEqual([row['title'] for row in data['results']], [f"Book {i}" for i in range(240, 250)])
+        self.assertIsNone(data['next'])
+        self.assertEqual(len(self.client.get('/api/books/', {'offset': 0}).json()['results']), 20)
+
+    def test_max_page_size(self):
+        self.assertEqual(len(self.client.get('/api/books/', {'page_size': 1000}).json()['results']), 100)
+        self.assertEqual(len(self.client.get('/api/books/', {'limit': 1000}).json()['results']), 100)
+
+    def test_browsable_api(self):
+        response = self.client.get('/api/books/', {'limit': 10}, HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, 200)
+
+
+class BulkActionTests(APITestCase):
+    url = '/api/books_all/bulk/'
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="admin"))
+        self.books = [Book.objects.create(title=f"Book {i}", author="Anon" if i < 3 else "Someone") for i in range(5)]
+        self.ids = [book.pk for book in self.books]
+
+    def test_bulk_update(self):
+        payload = [{'id': self.ids[0], 'title': "First"}, {'id': self.ids[1], 'author': "Named"}]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['status'] for r in response.data['results']], ['updated', 'updated'])
+        self.assertEqual(sum(q['sql'].startswith('UPDATE') for q in ctx.captured_queries), 1)
+        self.assertEqual(Book.objects.get(pk=self.ids[0]).title, "First")
+        self.assertEqual(Book.objects.get(pk=self.ids[1]).author, "Named")
+
+    def test_bulk_update_is_all_or_nothing(self):
+        payload = [{'id': self.ids[0], 'title': "Changed"}, {'id': self.ids[1], 'title': ""}, {'id': 999, 'title': "X"}]
+        response = self.client.patch(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([r['status'] for r in response.data['results']], ['not_updated', 'invalid', 'not_found'])
+        self.assertIn('title', response.data['results'][1]['errors'])
+        self.assertEqual(Book.objects.get(pk=self.ids[0]).title, "Book 0")
+
+    def test_bulk_update_rejects_bad_payloads(self):
+        for payload in [[], {'id': 1}, [{'title': "no id"}], [{'id': self.ids[0]}, {'id': self.ids[0]}]]:
+            self.assertEqual(self.client.patch(self.url, payload, format='json').status_code, 400, payload)
+
+    def test_bulk_delete_by_ids(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.delete(self.url, {'ids': [self.ids[0], self.ids[1], 999]}, format='json')
+        self.assertEqual(response.data['results'], [
+            {'id': self.ids[0], 'status': 'deleted'},
+            {'id': self.ids[1], 'status': 'deleted'},
+            {'id': 999, 'status': 'not_found'},
+        ])
+        self.assertEqual(sum(q['sql'].startswith('DELETE') for q in ctx.captured_queries), 1)
+        self.assertEqual(Book.objects.count(), 3)
+
+    def test_bulk_delete_by_filter(self):
+        response = self.client.delete(self.url, {'filter': {'author': "Anon"}}, format='json')
+        self.assertEqual([r['id'] for r in response.data['results']], self.ids[:3])
+        self.assertEqual(set(Book.objects.values_list('author', flat=True)), {"Someone"})
+        for payload in [{}, {'filter': {}}, {'filter': {'id__gt': 0}}, {'ids': []}, {'ids': [True]}]:
+            self.assertEqual(self.client.delete(self.url, payload, format='json').status_code, 400, payload)
+
+    def test_bulk_delete_limit(self):
+        with self.settings(BOOK_BULK_MAX_ITEMS=2):
+            response = self.client.delete(self.url, {'filter': {'author': "Anon"}}, format='json')
+            self.assertEqual(response.status_code, 400)
+            response = self.client.delete(self.url, {'ids': [self.ids[0], 998, 999]}, format='json')
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(Book.objects.count(), 5)
+
+
+class IdempotencyKeyTests(APITestCase):
+    url = '/api/books_all/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="client")
+        self.client.force_authenticate(self.user)
+
+    def post(self, data, key="key-1"):
+        return self.client.post(self.url, data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_without_touching_books(self):
+        first = self.post({'title': "Kindred", 'author': "Octavia E. Butler"})
+        self.assertEqual(first.status_code, 201)
+        with CaptureQueriesContext(connection) as ctx:
+            retry = self.post({'author': "Octavia E. Butler", 'title': "Kindred"})
+        # Only the shared cache table is read
+        self.assertTrue(ctx.captured_queries)
+        self.assertFalse([q for q in ctx.captured_queries if 'api_book' in q['sql']])
+        self.assertEqual((retry.status_code, retry.data), (201, first.data))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Book.objects.count(), 1)
+        # A new key is a new request
+        self.post({'title': "Kindred", 'author': "Octavia E. Butler"}, key="key-2")
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_key_reused_with_other_body(self):
+        self.post({'title': "Kindred", 'author': "Octavia E. Butler"})
+        self.assertEqual(self.post({'title': "Dawn", 'author': "Octavia E. Butler"}).status_code, 422)
+
+    def test_in_flight(self):
+        data = {'title': "Kindred", 'author': "Octavia E. Butler"}
+        cache_key = idempotency_store.make_key(self.user, 'POST', '/api/books_all/', "key-1")
+        request = mock.Mock(data=data)
+        idempotency_store.claim(cache_key, request_fingerprint(request))
+        self.assertEqual(self.post(data).status_code, 409)
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_keys_are_per_user(self):
+        self.post({'title': "Kindred", 'author': "Octavia E. Butler"})
+        self.client.force_authenticate(User.objects.create_user(username="other"))
+        response = self.post({'title': "Kindred", 'author': "Octavia E. Butler"})
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_update_and_destroy(self):
+        book = Book.objects.create(title="Kindred", author="Butler")
+        detail = f'{self.url}{book.pk}/'
+        for _ in range(2):
+            response = self.client.patch(detail, {'author': "Octavia E. Butler"}, format='json', HTTP_IDEMPOTENCY_KEY="p")
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+        for _ in range(2):
+            response = self.client.delete(detail, HTTP_IDEMPOTENCY_KEY="d")
+            self.assertEqual(response.status_code, 204)
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+
+    def test_raised_client_errors_are_stored(self):
+        # Like a returned 400 (bulk PATCH), a raised one is replayed
+        for _ in range(2):
+            response = self.post({'title': "", 'author': "Octavia E. Butler"})
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+        for _ in range(2):
+            response = self.client.delete(f'{self.url}999/', HTTP_IDEMPOTENCY_KEY="gone")
+        self.assertEqual((response.status_code, response['Idempotent-Replayed']), (404, 'true'))
+
+    def test_store_is_shared_between_processes(self):
+        self.assertEqual(idempotency_store.alias, 'shared')
+        self.assertIsInstance(idempotency_store.cache, DatabaseCache)
+
+    def test_bulk_actions(self):
+        books = [Book.objects.create(title=f"Book {i}", author="Anon") for i in range(2)]
+        for _ in range(2):
+            response = self.client.patch(f'{self.url}bulk/', [{'id': books[0].pk, 'title': "Renamed"}],
+                                         format='json', HTTP_IDEMPOTENCY_KEY="bp")
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+        for _ in range(2):
+            response = self.client.delete(f'{self.url}bulk/', {'ids': [books[1].pk]}, format='json',
+                                          HTTP_IDEMPOTENCY_KEY="bd")
+            self.assertEqual(response.data['results'], [{'id': books[1].pk, 'status': 'deleted'}])
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+
+    def test_without_key(self):
+        self.client.post(self.url, {'title': "Kindred", 'author': "Octavia E. Butler"}, format='json')
+        self.client.post(self.url, {'title': "Kindred", 'author': "Octavia E. Butler"}, format='json')
+        self.assertEqual(Book.objects.count(), 2)
+
+
+class BatchTests(APITestCase):
+    url = '/api/batch/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="dashboard")
+        self.key = ExpiringToken.issue(self.user)[1]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.key}")
+        self.book = Book.objects.create(title="Beloved", author="Toni Morrison")
+
+    def batch(self, requests, **options):
+        return self.client.post(self.url, {'requests': requests, **options}, format='json')
+
+    def test_runs_in_order_with_one_authentication(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.batch([
+                {'method': 'GET', 'path': '/api/books/'},
+                {'method': 'POST', 'path': '/api/books_all/', 'body': {'title': "Jazz", 'author': "Toni Morrison"}},
+                {'method': 'GET', 'path': '/api/books_all/?limit=5'},
+                {'method': 'PATCH', 'path': f'/api/books_all/{self.book.pk}/', 'body': {'title': "Sula"}},
+            ])
+        self.assertEqual(response.status_code, 200)
+        statuses = [r['status'] for r in response.data['responses']]
+        self.assertEqual(statuses, [200, 201, 200, 200])
+        self.assertEqual(response.data['responses'][2]['body']['count'], 2)
+        self.assertEqual(Book.objects.get(pk=self.book.pk).title, "Sula")
+        self.assertEqual(sum('api_expiringtoken' in q['sql'] for q in ctx.captured_queries), 1)
+
+    def test_errors_are_per_item(self):
+        response = self.batch([
+            {'method': 'GET', 'path': '/api/books_all/999/'},
+            {'method': 'GET', 'path': '/api/nowhere/'},
+            {'method': 'POST', 'path': '/api/books_all/', 'body': {'title': ""}},
+            {'method': 'POST', 'path': '/api/batch/', 'body': {'requests': []}},
+            {'method': 'GET', 'path': '/admin/'},
+        ])
+        self.assertEqual([r['status'] for r in response.data['responses']], [404, 404, 400, 400, 400])
+
+    def test_exception_fails_only_its_item(self):
+        with mock.patch.object(BookList, 'list', side_effect=RuntimeError("boom")), \
+                self.assertLogs('api.batch', 'ERROR'):
+            response = self.batch([
+                {'method': 'POST', 'path': '/api/books_all/', 'body': {'title': "Jazz", 'author': "Toni Morrison"}},
+                {'method': 'GET', 'path': '/api/books/'},
+                {'method': 'GET', 'path': '/api/books_all/'},
+            ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['status'] for r in response.data['responses']], [201, 500, 200])
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_items_use_batch_authentication_only(self):
+        # An item can't switch users with its own Authorization header
+        other = ExpiringToken.issue(User.objects.create_user(username="other"))[1]
+        request = APIRequestFactory().get('/api/books/', HTTP_AUTHORIZATION=f"Token {other}")
+        self.assertIsNone(SubRequestAuthentication().authenticate(request))
+        response = self.batch([{'method': 'POST', 'path': '/api/books_all/',
+                                'headers': {'Authorization': f"Token {other}"},
+                                'body': {'title': "Jazz", 'author': "Toni Morrison"}}])
+        self.assertEqual(response.data['responses'][0]['status'], 201)
+
+    def test_atomic_rolls_back_on_failure(self):
+        response = self.batch([
+            {'method': 'POST', 'path': '/api/books_all/', 'body': {'title': "Jazz", 'author': "Toni Morrison"}},
+            {'method': 'DELETE', 'path': f'/api/books_all/{self.book.pk}/'},
+            {'method': 'PATCH', 'path': '/api/books_all/999/', 'body': {'title': "X"}},
+            {'method': 'GET', 'path': '/api/books/'},
+        ], atomic=True)
+        self.assertTrue(response.data['rolled_back'])
+        self.assertEqual([r['status'] for r in response.data['responses']], [201, 204, 404, 424])
+        self.assertEqual(list(Book.objects.values_list('title', flat=True)), ["Beloved"])
+
+    def test_atomic_items_reject_idempotency_keys(self):
+        item = {'method': 'POST', 'path': '/api/books_all/', 'headers': {'Idempotency-Key': "K"},
+                'body': {'title': "Jazz", 'author': "Toni Morrison"}}
+        response = self.batch([item, {'method': 'GET', 'path': '/api/nowhere/'}], atomic=True)
+        self.assertEqual([r['status'] for r in response.data['responses']], [400, 424])
+        # Nothing was stored for K: a later request with it really runs
+        response = self.client.post('/api/books_all/', item['body'], format='json', HTTP_IDEMPOTENCY_KEY="K")
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+        # Outside atomic batches the key works as usual
+        replayed = self.batch([item]).data['responses'][0]
+        self.assertEqual((replayed['status'], replayed['headers'].get('Idempotent-Replayed')), (201, 'true'))
+
+    def test_atomic_commits_on_success(self):
+        response = self.batch([
+            {'method': 'POST', 'path': '/api/books_all/', 'body': {'title': "Jazz", 'author': "Toni Morrison"}},
+        ], atomic=True)
+        self.assertFalse(response.data['rolled_back'])
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_limits_and_auth(self):
+        with self.settings(BATCH_MAX_REQUESTS=2):
+            response = self.batch([{'method': 'GET', 'path': '/api/books/'}] * 3)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.batch([]).status_code, 400)
+        self.client.credentials()
+        self.assertEqual(self.batch([{'method': 'GET', 'path': '/api/books/'}]).status_code, 401)
+
+
+class EventBrokerTests(APITestCase):
+
+    async def test_publish_from_other_thread(self):
+        broker = EventBroker(buffer_size=3, queue_size=10)
+        queue, backlog = broker.subscribe()
+        self.assertEqual(backlog, [])
+        thread = threading.Thread(target=broker.publish, args=('created', {'id': 1}))
+        thread.start()
+        event = await asyncio.wait_for(queue.get(), timeout=1)
+        thread.join()
+        self.assertEqual((event.id, event.name, event.data), (f'{broker.epoch}-1', 'created', {'id': 1}))
+
+    async def test_resume_from_buffer(self):
+        broker = EventBroker(buffer_size=3)
+        for i in range(5):
+            broker.publish('updated', {'id': i})
+        self.assertEqual([e.seq for e in broker.subscribe(f'{broker.epoch}-3')[1]], [4, 5])
+        self.assertEqual(broker.subscribe(f'{broker.epoch}-5')[1], [])
+        # Older than the buffer, ahead of us, or garbage: start over
+        for last_event_id in [f'{broker.epoch}-1', f'{broker.epoch}-99', 'nonsense']:
+            backlog = broker.subscribe(last_event_id)[1]
+            self.assertEqual([(e.name, e.id) for e in backlog], [('reset', f'{broker.epoch}-5')])
+
+    async def test_ids_from_another_process_reset(self):
+        # A restarted process (new broker) has caught up past the client's id:
+        # the sequence numbers look servable, but the epoch gives it away
+        old, new = EventBroker(), EventBroker()
+        for i in range(500):
+            old.publish('created', {'id': i})
+        for i in range(600):
+            new.publish('created', {'id': i})
+        self.assertNotEqual(old.epoch, new.epoch)
+        self.assertEqual([e.name for e in new.subscribe(f'{old.epoch}-500')[1]], ['reset'])
+
+    async def test_slow_subscriber_is_dropped(self):
+        broker = EventBroker(queue_size=3)
+        queue, _ = broker.subscribe()
+        broker.publish('created', {'id': 0})
+        await asyncio.sleep(0)  # Let the loop run the deliveries
+        last_read = queue.get_nowait()
+        for i in range(1, 5):
+            broker.publish('created', {'id': i})
+        await asyncio.sleep(0)
+        self.assertNotIn(queue, broker.subscribers)
+        # Nothing unread is left before the overflow marker...
+        self.assertIs(queue.get_nowait(), OVERFLOW)
+        self.assertTrue(queue.empty())
+        # ...so resuming from the last event read misses nothing
+        backlog = broker.subscribe(last_read.id)[1]
+        self.assertEqual([event.data['id'] for event in backlog], [1, 2, 3, 4])
+
+    async def test_closed_stream_unsubscribes(self):
+        token = mock.Mock(expires=timezone.now() + timedelta(hours=1))
+        queue, backlog = events.broker.subscribe()
+        body = events.stream(queue, backlog, heartbeat=1, token=token)
+        self.assertEqual(await anext(body), 'retry: 3000\n\n')
+        await body.aclose()  # What the ASGI handler does when the client disconnects
+        self.assertNotIn(queue, events.broker.subscribers)
+
+
+class BookEventTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.broker = EventBroker()
+        patcher = mock.patch.object(events, 'broker', self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user(username="watcher")
+        self.token, self.key = ExpiringToken.issue(self.user)
+        self.auth = {'Authorization': f"Token {self.key}"}
+
+    def published(self):
+        return [(event.name, event.data.get('title', event.data['id'])) for event in self.broker.buffer]
+
+    def test_writes_are_published_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            book = Book.objects.create(title="Beloved", author="Toni Morrison")
+        with self.captureOnCommitCallbacks(execute=True):
+            book.title = "Sula"
+            book.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            pk = book.pk
+            book.delete()
+        self.assertEqual(self.published(), [('created', "Beloved"), ('updated', "Sula"), ('deleted', pk)])
+
+    def test_bulk_actions_and_rollbacks(self):
+        books = [Book.objects.create(title=f"Book {i}", author="Anon") for i in range(2)]
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch('/api/books_all/bulk/', [{'id': books[0].pk, 'title': "Renamed"}], format='json')
+            self.client.delete('/api/books_all/bulk/', {'ids': [books[1].pk]}, format='json')
+            self.client.post('/api/batch/', {'atomic': True, 'requests': [
+                {'method': 'POST', 'path': '/api/books_all/', 'body': {'title': "Rolled back", 'author': "X"}},
+                {'method': 'DELETE', 'path': '/api/books_all/999/'},
+            ]}, format='json')
+        self.assertEqual(self.published(), [('updated', "Renamed"), ('deleted', books[1].pk)])
+
+    async def read(self, response, chunks):
+        content = response.streaming_content
+        return ''.join([(await anext(content)).decode() for _ in range(chunks)])
+
+    async def test_stream_resumes_from_last_event_id(self):
+        for i in range(3):
+            self.broker.publish('created', {'id': i})
+        epoch = self.broker.epoch
+        response = await self.async_client.get('/api/books/events/', headers={**self.auth, 'Last-Event-ID': f'{epoch}-2'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = await self.read(response, 2)
+        self.assertEqual(body, f'retry: 3000\n\nid: {epoch}-3\nevent: created\ndata: {{"id": 2}}\n\n')
+
+    async def test_live_events_and_heartbeat(self):
+        with self.settings(BOOK_EVENTS={'HEARTBEAT': 0.01}):
+            response = await self.async_client.get('/api/books/events/', headers=self.auth)
+        content = response.streaming_content
+        self.assertEqual(await anext(content), b'retry: 3000\n\n')
+        self.assertEqual(await anext(content), b': heartbeat\n\n')
+        await asyncio.to_thread(self.broker.publish, 'deleted', {'id': 7})
+        self.assertEqual(await self.read(response, 1), f'id: {self.broker.epoch}-1\nevent: deleted\ndata: {{"id": 7}}\n\n')
+
+    async def test_stream_ends_when_token_expires_or_is_revoked(self):
+        self.token.expires = timezone.now() + timedelta(seconds=0.05)
+        await self.token.asave()
+        response = await self.async_client.get('/api/books/events/', headers=self.auth)
+        self.assertEqual(await self.read(response, 2), 'retry: 3000\n\nevent: expired\ndata: {}\n\n')
+
+        token, key = await sync_to_async(ExpiringToken.issue)(self.user)
+        with self.settings(BOOK_EVENTS={'HEARTBEAT': 0.01}):
+            response = await self.async_client.get('/api/books/events/', headers={'Authorization': f"Token {key}"})
+        await token.adelete()
+        self.assertEqual(await self.read(response, 2), 'retry: 3000\n\nevent: expired\ndata: {}\n\n')
+
+    async def test_requires_valid_token_in_header(self):
+        self.assertEqual((await self.async_client.get('/api/books/events/')).status_code, 401)
+        response = await self.async_client.get('/api/books/events/', headers={'Authorization': "Token nope"})
+        self.assertEqual(response.status_code, 401)
+        # Raw tokens in the URL would be logged: not accepted
+        response = await self.async_client.get('/api/books/events/', {'token': self.key})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_single_use_ticket(self):
+        response = await sync_to_async(self.client.post)('/api/books/events/ticket/', headers=self.auth)
+        self.assertEqual(response.status_code, 201)
+        ticket = response.data['ticket']
+        response = await self.async_client.get('/api/books/events/', {'ticket': ticket})
+        self.assertEqual(await self.read(response, 1), 'retry: 3000\n\n')
+        response = await self.async_client.get('/api/books/events/', {'ticket': ticket})
+        self.assertEqual(response.status_code, 401)
+
+    def test_wsgi_is_refused(self):
+        # The sync test client goes through the WSGI handler
+        response = self.client.get('/api/books/events/', headers=self.auth)
+        self.assertEqual(response.status_code, 501)
@@ -1,13 +1,18 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework.authtoken.views import obtain_auth_token
-from .views import BookList, BookViewSet
+from .batch import BatchView
+from .events import book_events
+from .views import BookList, BookViewSet, EventStreamTicket, ObtainExpiringToken, RotateToken
 
 router = DefaultRouter()
 router.register(r'books_all', BookViewSet, basename='book_all')
 
 urlpatterns = [
     path('books/', BookList.as_view(), name='book-list'),  # Optional list-only view
-    path('auth/token/', obtain_auth_token, name='api-token'),  # 🔑 Token login endpoint
+    path('books/events/', book_events, name='book-events'),  # 📡 Server-sent Book events (ASGI)
+    path('books/events/ticket/', EventStreamTicket.as_view(), name='book-events-ticket'),  # 🎟️ Single-use stream ticket
+    path('auth/token/', ObtainExpiringToken.as_view(), name='api-token'),  # 🔑 Token login endpoint (expiring token)
+    path('auth/token/rotate/', RotateToken.as_view(), name='api-token-rotate'),  # 🔄 Swap token for a new one
+    path('batch/', BatchView.as_view(), name='batch'),  # 📦 Several API calls in one request
     path('', include(router.urls)),  # ViewSet CRUD endpoints
 ]
\ No newline at end of file
@@ -1,14 +1,85 @@
-from rest_framework import generics, viewsets
+from rest_framework import generics, status, viewsets
+from rest_framework.authtoken.serializers import AuthTokenSerializer
+from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated  # 👈 Import permission
-from .models import Book
+from .bulk import BulkActionsMixin
+from .events import issue_ticket, publish_on_commit
+from .idempotency import IdempotencyMixin
+from .models import Book, ExpiringToken
+from .negotiation import MessagePackMixin
 from .serializers import BookSerializer
 
-class BookList(generics.ListAPIView):
+class BookList(MessagePackMixin, generics.ListAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]  # 👈 Require token auth
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(MessagePackMixin, IdempotencyMixin, BulkActionsMixin, viewsets.ModelViewSet):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]  # 👈 Require token auth
+    bulk_filter_fields = ['title', 'author']  # DELETE books_all/bulk/ {"filter": {...}}
+
+    # bulk_update() sends no post_save, so publish its events here. Bulk deletes
+    # need nothing: the post_delete receiver in signals.py fires for each row.
+    def bulk_updated(self, instances):
+        for instance in instances:
+            publish_on_commit('updated', dict(self.get_serializer(instance).data))
+
+    # Idempotency-Key on the bulk writes as well. Redeclared (not just
+    # overridden) so the router still sees them as actions.
+    @action(detail=False, methods=['patch'], url_path='bulk')
+    def bulk_update(self, request, *args, **kwargs):
+        return self.idempotent(super().bulk_update, request, *args, **kwargs)
+
+    @bulk_update.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs):
+        return self.idempotent(super().bulk_destroy, request, *args, **kwargs)
+
+
+def token_response(token, key, status_code=status.HTTP_200_OK):
+    return Response({'token': key, 'expires': token.expires}, status=status_code)
+
+
+class ObtainExpiringToken(ObtainAuthToken):
+    """
+    POST username + password -> a new expiring token. Only its digest is
+    stored, so the raw token is in this response and nowhere else.
+    """
+
+    def post(self, request, *args, **kwargs):
+        serializer = AuthTokenSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        token, key = ExpiringToken.issue(serializer.validated_data['user'])
+        return token_response(token, key)
+
+
+class RotateToken(APIView):
+    """POST with a valid token -> a new token; the old one stops working at once."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.auth, ExpiringToken):
+            raise ValidationError({'detail': 'Authenticate with the token to rotate.'})
+        token, key = ExpiringToken.issue(request.user)
+        request.auth.delete()
+        return token_response(token, key, status.HTTP_201_CREATED)
+
+
+class EventStreamTicket(APIView):
+    """
+    POST with a valid token -> a single-use ticket for
+    GET /api/books/events/?ticket=..., for clients (browsers' EventSource)
+    that can't send an Authorization header. The stream lives as long as
+    the token it was issued for.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.auth, ExpiringToken):
+            raise ValidationError({'detail': 'Authenticate with a token to get a ticket.'})
+        return Response({'ticket': issue_ticket(request.auth)}, status=status.HTTP_201_CREATED)
@@ -5,6 +5,13 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Serve /api/books/events/ (server-sent Book events) from this app, e.g.
+``uvicorn api_project.asgi:application``: each stream is a coroutine, while
+under WSGI it would hold a worker thread for as long as the client stays
+connected, so the WSGI app answers it with 501. Events are fanned out
+in-process (api/events.py), so a client only sees writes made by the same
+process: run one ASGI process, or route writes through it.
 """
 
 import os
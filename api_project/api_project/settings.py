@@ -125,12 +125,77 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# 'shared' is seen by every worker process (and survives restarts): state
+# that must not depend on which worker a request reaches lives there.
+# Create its table with `python manage.py createcachetable`.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api-project',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'api_shared_cache',
+    },
+}
+
+# Token -> user cache of api.authentication.CachedTokenAuthentication.
+# Use a shared cache (e.g. Redis/Memcached) in ALIAS when running several workers:
+# invalidation only reaches the cache the deleting process writes to.
+TOKEN_AUTH_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 60,
+}
+
+# api.models.ExpiringToken: seconds a token issued by /api/auth/token/ (or
+# /api/auth/token/rotate/) is valid. Expired rows are removed by purge_expired_tokens.
+EXPIRING_TOKEN = {
+    'LIFETIME': 24 * 60 * 60,
+}
+
+# Stored responses for Idempotency-Key retries on /api/books_all/ writes
+# (api/idempotency.py): kept TTL seconds; LOCK_TIMEOUT bounds a claim whose
+# request never finished. ALIAS must be shared by all workers (a retry can
+# reach any of them), so not a per-process LocMemCache.
+IDEMPOTENCY = {
+    'ALIAS': 'shared',
+    'TTL': 24 * 60 * 60,
+    'LOCK_TIMEOUT': 60,
+}
+
+# Most books one PATCH/DELETE /api/books_all/bulk/ request may touch
+BOOK_BULK_MAX_ITEMS = 1000
+
+# Most sub-requests in one POST /api/batch/
+BATCH_MAX_REQUESTS = 30
+
+# Server-sent Book events (/api/books/events/, api/events.py): events kept for
+# Last-Event-ID resume, events queued per slow client before it is dropped,
+# seconds between heartbeats on an idle stream, and seconds a stream ticket
+# (for browsers, whose EventSource can't send the token) stays valid, in a
+# cache every worker sees
+BOOK_EVENTS = {
+    'BUFFER_SIZE': 1000,
+    'QUEUE_SIZE': 100,
+    'HEARTBEAT': 15,
+    'TICKET_TTL': 30,
+    'TICKET_CACHE': 'shared',
+}
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.ExpiringTokenAuthentication',  # Hashed, expiring tokens + cache
+        'api.authentication.SubRequestAuthentication',  # Items of /api/batch/ run as the batch's user
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',  # Default: all endpoints require login
-    ]
+    ],
+    # Cursor pages by default, limit/offset with ?limit=/?offset=; at most 100 rows
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.BookPagination',
+    'PAGE_SIZE': 20,
+    # orjson-backed JSON (falls back to the stdlib encoder when orjson is missing)
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
\ No newline at end of file